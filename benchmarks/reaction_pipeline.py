@@ -0,0 +1,235 @@
+"""Benchmarks for the reaction command pipeline.
+
+Drives :meth:`ReactionBot.on_raw_reaction_add` with synthetic
+:class:`discord.RawReactionActionEvent` payloads. The bot never logs in and
+every HTTP call is replaced with a no-op, so nothing touches the network.
+
+Usage::
+
+    python benchmarks/reaction_pipeline.py
+    python benchmarks/reaction_pipeline.py --scenario flood --events 100000
+    python benchmarks/reaction_pipeline.py --scenario sessions --sessions 5000 --tracemalloc
+"""
+import argparse
+import asyncio
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+
+import discord
+from discord.ext import reactioncommands
+
+PREFIX = '\U0001f914'
+LISTENING = '\U0001f440'
+COMMAND = ('\U0001f34e', '\U0001f34c', '\U0001f95d')
+NOT_A_COMMAND = '\U0001f44d'
+
+GUILD_ID = 81384788765712384
+CHANNEL_ID = 381963689470984203
+MESSAGE_ID = 871384788765712384
+
+
+class FakeHTTP:
+    """Stands in for :class:`discord.http.HTTPClient`, every request is a no-op."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def __getattr__(self, name):
+        async def request(*args, **kwargs):
+            self.requests += 1
+        return request
+
+
+def make_payload(emoji, *, user_id, message_id=MESSAGE_ID, event_type='REACTION_ADD'):
+    data = {'message_id': message_id, 'channel_id': CHANNEL_ID,
+            'user_id': user_id, 'guild_id': GUILD_ID}
+    return discord.RawReactionActionEvent(data, discord.PartialEmoji(name=emoji), event_type)
+
+
+async def make_bot(invoked):
+    bot = reactioncommands.ReactionBot(command_prefix='!', prefix_emoji=PREFIX,
+                                       listening_emoji=LISTENING, listen_timeout=30,
+                                       intents=discord.Intents.default())
+    if hasattr(bot, '_async_setup_hook'):
+        # discord.py 2.0 sets up the loop on login
+        await bot._async_setup_hook()
+    bot.http = bot._connection.http = FakeHTTP()
+    bot._connection.user = discord.ClientUser(state=bot._connection, data={
+        'id': 1, 'username': 'bench', 'discriminator': '0000', 'avatar': None, 'bot': True
+    })
+
+    @bot.reaction_command(''.join(COMMAND))
+    async def bench(ctx):
+        invoked.append(ctx)
+
+    return bot
+
+
+def open_sessions(bot):
+    return sum(stats['sessions'] for stats in bot.reaction_shard_stats().values())
+
+
+async def wait_for_sessions(bot, count):
+    while open_sessions(bot) < count:
+        await asyncio.sleep(0)
+
+
+class Result:
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.elapsed = 0.0
+        self.events = 0
+        self.gc_collections = 0
+        self.retained_blocks = 0
+        self.peak_memory = None
+        self.extra = {}
+
+    def report(self):
+        latencies = sorted(self.latencies)
+        lines = [f'{self.name}',
+                 f'  events:             {self.events}',
+                 f'  events/sec:         {self.events / self.elapsed:,.0f}']
+        if latencies:
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            lines.append(f'  latency p50:        {statistics.median(latencies) * 1000:.3f} ms')
+            lines.append(f'  latency p99:        {p99 * 1000:.3f} ms')
+        lines.append(f'  gen0 GCs/event:     {self.gc_collections / self.events:.4f} '
+                     f'({self.gc_collections} total)')
+        lines.append(f'  retained blocks/ev: {self.retained_blocks / self.events:.1f}')
+        if self.peak_memory is not None:
+            lines.append(f'  peak bytes/event:   {self.peak_memory / self.events:.1f}')
+        for key, value in self.extra.items():
+            lines.append(f'  {key + ":":<20}{value}')
+        return '\n'.join(lines)
+
+
+class measure:
+    """Times a block and counts gen0 collections and memory blocks still
+    allocated after it (from :func:`sys.getallocatedblocks`), optionally with
+    tracemalloc.
+    """
+
+    def __init__(self, result, trace):
+        self.result = result
+        self.trace = trace
+
+    def __enter__(self):
+        gc.collect()
+        if self.trace:
+            tracemalloc.start()
+        self.collections = gc.get_stats()[0]['collections']
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.result.elapsed += time.perf_counter() - self.start
+        self.result.gc_collections += gc.get_stats()[0]['collections'] - self.collections
+        gc.collect()
+        self.result.retained_blocks += sys.getallocatedblocks() - self.blocks
+        if self.trace:
+            self.result.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+async def bench_flood(events, trace):
+    """Reactions that aren't a prefix or command, the most common case."""
+    bot = await make_bot([])
+    payloads = [make_payload(NOT_A_COMMAND, user_id=1000 + i % 500) for i in range(events)]
+    result = Result('non-command reaction flood')
+    result.events = events
+    perf_counter = time.perf_counter
+    with measure(result, trace):
+        for payload in payloads:
+            start = perf_counter()
+            await bot.on_raw_reaction_add(payload)
+            result.latencies.append(perf_counter() - start)
+    return result
+
+
+async def bench_command(events, trace):
+    """Prefix, 3 emoji command, then prefix removed to invoke."""
+    invoked = []
+    bot = await make_bot(invoked)
+    result = Result('prefix + 3-emoji command')
+    result.events = events * (len(COMMAND) + 2)
+    perf_counter = time.perf_counter
+    with measure(result, trace):
+        for i in range(events):
+            user_id = 1000 + i
+            start = perf_counter()
+            task = asyncio.ensure_future(bot.on_raw_reaction_add(make_payload(PREFIX, user_id=user_id)))
+            await wait_for_sessions(bot, 1)
+            for emoji in COMMAND:
+                bot.dispatch('raw_reaction_add', make_payload(emoji, user_id=user_id))
+            bot.dispatch('raw_reaction_remove',
+                         make_payload(PREFIX, user_id=user_id, event_type='REACTION_REMOVE'))
+            await task
+            result.latencies.append(perf_counter() - start)
+    # let cleanup tasks finish
+    await asyncio.sleep(0.01)
+    result.extra['commands invoked'] = len(invoked)
+    result.extra['http requests'] = bot.http.requests
+    return result
+
+
+async def bench_sessions(sessions, trace):
+    """Many listening sessions open at once, one emoji routed to each."""
+    invoked = []
+    bot = await make_bot(invoked)
+    result = Result(f'{sessions} concurrent listening sessions')
+    result.events = sessions * (len(COMMAND) + 1)
+    perf_counter = time.perf_counter
+    with measure(result, trace):
+        start = perf_counter()
+        tasks = [asyncio.ensure_future(bot.on_raw_reaction_add(make_payload(PREFIX, user_id=1000 + i,
+                                                                           message_id=MESSAGE_ID + i % 50)))
+                 for i in range(sessions)]
+        await wait_for_sessions(bot, sessions)
+        result.extra['time to open'] = f'{(perf_counter() - start) * 1000:.1f} ms'
+        result.extra['sessions open'] = open_sessions(bot)
+
+        for emoji in COMMAND:
+            for i in range(sessions):
+                payload = make_payload(emoji, user_id=1000 + i, message_id=MESSAGE_ID + i % 50)
+                start = perf_counter()
+                bot.dispatch('raw_reaction_add', payload)
+                result.latencies.append(perf_counter() - start)
+            await asyncio.sleep(0)
+
+        for i in range(sessions):
+            bot.dispatch('raw_reaction_remove', make_payload(PREFIX, user_id=1000 + i,
+                                                             message_id=MESSAGE_ID + i % 50,
+                                                             event_type='REACTION_REMOVE'))
+        await asyncio.gather(*tasks)
+    await asyncio.sleep(0.01)
+    result.extra['commands invoked'] = len(invoked)
+    return result
+
+
+async def main(args):
+    results = []
+    if args.scenario in ('flood', 'all'):
+        results.append(await bench_flood(args.events, args.tracemalloc))
+    if args.scenario in ('command', 'all'):
+        results.append(await bench_command(max(1, args.events // 20), args.tracemalloc))
+    if args.scenario in ('sessions', 'all'):
+        results.append(await bench_sessions(args.sessions, args.tracemalloc))
+    print('\n\n'.join(result.report() for result in results))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the reaction command pipeline.')
+    parser.add_argument('--scenario', choices=('flood', 'command', 'sessions', 'all'), default='all')
+    parser.add_argument('--events', type=int, default=20000,
+                        help='reactions for the flood scenario, 1/20th of this for the command scenario')
+    parser.add_argument('--sessions', type=int, default=5000,
+                        help='concurrent sessions for the sessions scenario')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='also report peak traced memory, much slower')
+    asyncio.run(main(parser.parse_args()))
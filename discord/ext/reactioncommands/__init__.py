@@ -5,5 +5,11 @@ from .reactionhelp import *
 from .reactionproxy import *
 from .reactionerrors import *
 from .reactioncontext import *
+from .reactionmetrics import *
+from .reactionsession import *
+from .reactioncluster import *
+from .reactionexecutor import *
+from .reactionstore import *
+from .reactioncooldown import *
 
 __version__ = "0.3.0a"
@@ -1,36 +1,233 @@
 import time
 import asyncio
 import traceback
-from collections import Counter
+import collections.abc
+from collections import deque
 
 import discord
 from discord.ext import commands
 
 from .reactionhelp import ReactionHelp
+from .reactionmetrics import CallbackSink
+from .reactionstore import SessionRecord, _StoreWriter
+from .reactionsession import _ListeningSession, _ShardSessions, _EmojiBuffer, SessionScope
 from .reactioncontext import ReactionContext
-from .reactioncore import ReactionCommandMixin, ReactionGroupMixin
+from .reactioncore import ReactionGroupMixin, _TrieCursor
 from .reactionproxy import (ProxyUser, ProxyMember, ProxyTextChannel,
                             ProxyDMChannel, ProxyGuild, ProxyPayload)
 
 __all__ = ('ReactionBot', 'AutoShardedReactionBot', 'ReactionBotMixin')
 
+# max reaction removals running at once for one message
+_CLEANUP_CONCURRENCY = 4
+
+
+class _PendingCleanup:
+    """Reactions waiting to be removed from one message. Shared by every
+    session on that message that finishes before it's flushed.
+    """
+
+    __slots__ = ('message', 'removals', 'can_manage', 'task')
+
+    def __init__(self, message, can_manage):
+        self.message = message
+        # (emoji, user id) -> user
+        self.removals = {}
+        self.can_manage = can_manage
+        self.task = None
+
+
+class _ListeningEmojiRef:
+    """The listening emoji on one message, shared by every session on it."""
+
+    __slots__ = ('sessions', 'added')
+
+    def __init__(self, added):
+        self.sessions = 0
+        # future of the add_reaction call
+        self.added = added
+
+
+class _IndexedMessageDeque(deque):
+    """Replacement for the :class:`ConnectionState` message cache that also
+    keeps a dict of message id to message, kept up to date on append, remove,
+    and eviction by ``maxlen``.
+
+    Only the methods discord.py uses are tracked, don't use slicing/rotating
+    methods on this.
+    """
+
+    def __init__(self, iterable=(), maxlen=None):
+        super().__init__(maxlen=maxlen)
+        self._index = {}
+        self.extend(iterable)
+
+    def _forget(self, message):
+        if self._index.get(message.id) is message:
+            del self._index[message.id]
+
+    def get(self, message_id):
+        return self._index.get(message_id)
+
+    def append(self, message):
+        if self.maxlen == 0:
+            return
+        if len(self) == self.maxlen:
+            self._forget(self[0])
+        super().append(message)
+        self._index[message.id] = message
+
+    def appendleft(self, message):
+        if self.maxlen == 0:
+            return
+        if len(self) == self.maxlen:
+            self._forget(self[-1])
+        super().appendleft(message)
+        self._index.setdefault(message.id, message)
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def remove(self, message):
+        super().remove(message)
+        self._forget(message)
+
+    def pop(self):
+        message = super().pop()
+        self._forget(message)
+        return message
+
+    def popleft(self):
+        message = super().popleft()
+        self._forget(message)
+        return message
+
+    def clear(self):
+        super().clear()
+        self._index.clear()
+
 
 class ReactionBotMixin(ReactionGroupMixin):
     """Mixin for implementing reaction commands to Bot"""
     def __init__(self, command_prefix, prefix_emoji, listening_emoji, *args,
                  listen_timeout=15, listen_total_timeout=120, remove_reactions_after=True,
+                 emoji_cache_ttl=None, metrics_sink=None, session_scope=SessionScope.user,
+                 session_limits=None, complete_on_leaf=False, reaction_remove_mode='append',
+                 session_store=None, session_cooldown=None,
                  **kwargs):
+        self._no_prefix_emojis = set()
+        self._emoji_cache = {}
+        self._session_scope = session_scope
+        self._shard_sessions = {}
+        self.emoji_cache_ttl = emoji_cache_ttl
         self.prefix_emoji = prefix_emoji
         self.listening_emoji = listening_emoji
         self.listen_timeout = listen_timeout
         self.listen_total_timeout = listen_total_timeout
-        self._active_ctx_sessions = Counter()
+        self._pending_cleanups = {}
+        self._listening_emojis = {}
         self.remove_reactions_after = remove_reactions_after
         self._debug_ = kwargs.get('_debug', False)
-        self._mc = commands.MaxConcurrency(1, per=commands.BucketType.user, wait=False)
+        if metrics_sink is not None and not hasattr(metrics_sink, 'record'):
+            metrics_sink = CallbackSink(metrics_sink)
+        self.metrics_sink = metrics_sink
+        self.session_limits = session_limits
+        self.complete_on_leaf = complete_on_leaf
+        if reaction_remove_mode not in ('undo', 'append', 'toggle'):
+            raise ValueError(f"reaction_remove_mode must be 'undo', 'append' or 'toggle', not {reaction_remove_mode!r}")
+        self.reaction_remove_mode = reaction_remove_mode
+        self.session_store = session_store
+        self._store_writer = None
+        self.session_cooldown = session_cooldown
+        # (message id, user id) of stored sessions being resumed
+        self._resuming = set()
 
         kwargs.setdefault('help_command', ReactionHelp())
         super().__init__(command_prefix=command_prefix, *args, **kwargs)
+        self._message_index()
+
+    @property
+    def prefix_emoji(self):
+        """Union[:class:`Callable`, :class:`list`, :class:`str`]: The emoji(s)
+        used to start listening for commands. Setting this rebuilds the
+        internal set of emojis that can trigger a command.
+        """
+        return self._prefix_emoji
+
+    @prefix_emoji.setter
+    def prefix_emoji(self, value):
+        self._prefix_emoji = value
+        self._invalidate_emoji_cache('prefix_emoji')
+        self._rebuild_reaction_triggers()
+
+    @property
+    def listening_emoji(self):
+        """Union[:class:`Callable`, :class:`str`, :class:`None`]: The emoji
+        added to let the user know the bot is listening.
+        """
+        return self._listening_emoji
+
+    @listening_emoji.setter
+    def listening_emoji(self, value):
+        self._listening_emoji = value
+        self._invalidate_emoji_cache('listening_emoji')
+
+    def _static_emoji(self, attr):
+        """Whether ``attr`` is a plain value that its getter returns as is,
+        so it can be known ahead of time. Not if it's callable or a subclass
+        overrides the getter.
+        """
+        getter = 'get_' + attr
+        if getattr(type(self), getter) is not getattr(ReactionBotMixin, getter):
+            return False
+        return not callable(getattr(self, attr))
+
+    def _rebuild_reaction_triggers(self):
+        """Rebuilds the set of emojis that can start a session or invoke a
+        command without prefix. Set to ``None`` if :attr:`prefix_emoji` is
+        callable or :meth:`get_prefix_emoji` is overridden, since it can't be
+        known ahead of time.
+        """
+        if not self._static_emoji('prefix_emoji'):
+            self._reaction_triggers = None
+            return
+        prefix = self._prefix_emoji
+        triggers = {prefix} if isinstance(prefix, str) else set(prefix)
+        triggers.update(self._no_prefix_emojis)
+        self._reaction_triggers = frozenset(triggers)
+
+    def _is_reaction_trigger(self, emoji):
+        """Checks if an emoji could possibly start a session or invoke a
+        command. Used to drop irrelevant reactions before creating anything.
+        """
+        triggers = self._reaction_triggers
+        if triggers is None:
+            return True
+        emoji = str(emoji)
+        if emoji in triggers:
+            return True
+        return self._emoji_insensitive and self._emoji_key(emoji) in triggers
+
+    def add_command(self, command):
+        """Same as :meth:`.ReactionGroupMixin.add_command`. Also keeps track
+        of emojis for commands with :attr:`~.ReactionCommand.invoke_without_prefix`.
+        """
+        super().add_command(command)
+        if getattr(command, 'invoke_without_prefix', False):
+            self._no_prefix_emojis.update(map(self._emoji_key, command.emojis))
+            self._rebuild_reaction_triggers()
+
+    def remove_command(self, name):
+        """Same as :meth:`.ReactionGroupMixin.remove_command`. Also keeps track
+        of emojis for commands with :attr:`~.ReactionCommand.invoke_without_prefix`.
+        """
+        command = super().remove_command(name)
+        if (command is not None and name not in command.aliases
+                and getattr(command, 'invoke_without_prefix', False)):
+            self._no_prefix_emojis.difference_update(map(self._emoji_key, command.emojis))
+            self._rebuild_reaction_triggers()
+        return command
 
     async def get_context(self, message, *, cls=commands.Context):
         """Functions exactly the same as original :meth:`~discord.ext.commands.Bot.get_context`.
@@ -51,38 +248,339 @@ class ReactionBotMixin(ReactionGroupMixin):
                 print('failed to set ctx.reaction_command\n', e)
         return ctx
 
+    def dispatch(self, event_name, *args, **kwargs):
+        # route reactions straight to listening sessions instead of
+        # going through wait_for and every listener's check
+        if event_name in ('raw_reaction_add', 'raw_reaction_remove'):
+            payload = args[0]
+            self._sessions_for(payload.guild_id).router.route(payload)
+        elif event_name in ('ready', 'resumed', 'shard_ready', 'shard_resumed'):
+            if self.session_store is not None:
+                # live sessions keep going, stored ones that aren't live are resumed
+                self.loop.create_task(self.resume_reaction_sessions())
+            elif event_name == 'shard_ready':
+                self.drop_shard_sessions(args[0])
+            elif event_name == 'ready' and not isinstance(self, discord.AutoShardedClient):
+                # new gateway session, reactions were missed while disconnected
+                for shard_id in list(self._shard_sessions):
+                    self.drop_shard_sessions(shard_id)
+        super().dispatch(event_name, *args, **kwargs)
+
+    def _reaction_shard_id(self, guild_id):
+        """Shard id events from ``guild_id`` come from. DMs are always shard 0."""
+        if guild_id is None or not self.shard_count:
+            return 0
+        return (guild_id >> 22) % self.shard_count
+
+    def _sessions_for(self, guild_id):
+        shard_id = self._reaction_shard_id(guild_id)
+        sessions = self._shard_sessions.get(shard_id)
+        if sessions is None:
+            sessions = self._shard_sessions[shard_id] = _ShardSessions(shard_id, self._session_scope)
+        return sessions
+
+    def drop_shard_sessions(self, shard_id):
+        """Stops every listening session from a shard without invoking
+        their commands. Called when a shard starts a new gateway session since
+        reactions sent while it was disconnected are lost.
+
+        Parameters
+        ----------
+        shard_id: :class:`int`
+            The shard to drop sessions for. ``0`` if the bot isn't sharded.
+
+        Returns
+        -------
+        :class:`int`
+            The number of sessions that were dropped.
+        """
+        sessions = self._shard_sessions.get(shard_id)
+        if sessions is None:
+            return 0
+        dropped = sessions.router.sessions()
+        for session in dropped:
+            session.close('cancelled')
+        return len(dropped)
+
+    def cancel_reaction_sessions(self, *, message_id=None, user_id=None):
+        """Stops listening sessions without invoking their commands. With no
+        arguments every session is stopped.
+
+        Parameters
+        ----------
+        message_id: Optional[:class:`int`]
+            Only stop sessions on this message.
+        user_id: Optional[:class:`int`]
+            Only stop sessions for this user.
+
+        Returns
+        -------
+        :class:`int`
+            The number of sessions that were stopped.
+        """
+        cancelled = 0
+        for sessions in self._shard_sessions.values():
+            for session in sessions.router.sessions(message_id, user_id):
+                if session.expired is None:
+                    session.close('cancelled')
+                    cancelled += 1
+        return cancelled
+
+    def active_reaction_sessions(self, *, message_id=None, user_id=None):
+        """Gets the contexts of sessions that are listening for reactions.
+
+        Parameters
+        ----------
+        message_id: Optional[:class:`int`]
+            Only get sessions on this message.
+        user_id: Optional[:class:`int`]
+            Only get sessions for this user.
+
+        Returns
+        -------
+        list[:class:`.ReactionContext`]
+            Contexts of the matching sessions.
+        """
+        return [session.ctx
+                for sessions in self._shard_sessions.values()
+                for session in sessions.router.sessions(message_id, user_id)
+                if session.expired is None]
+
+    def reaction_shard_stats(self, shard_id=None):
+        """Gets listening session stats for each shard.
+
+        Parameters
+        ----------
+        shard_id: Optional[:class:`int`]
+            Only get stats for this shard. Default value is ``None``.
+
+        Returns
+        -------
+        dict[:class:`int`, dict[:class:`str`, :class:`int`]]
+            Mapping of shard id to stats. Stats are ``sessions`` currently
+            listening, ``claims`` held in the session guard, ``started`` and
+            ``rejected`` sessions, and ``cached_emojis`` from
+            ``emoji_cache_ttl``.
+        """
+        if shard_id is not None:
+            sessions = self._shard_sessions.get(shard_id)
+            return {shard_id: sessions.stats()} if sessions else {}
+        return {shard_id: sessions.stats() for shard_id, sessions in self._shard_sessions.items()}
+
+    async def resume_reaction_sessions(self):
+        """Resumes listening sessions saved in :attr:`session_store` that
+        aren't running, and cleans up the ones that expired while the bot was
+        offline. Called on ``ready`` and ``resumed`` when there's a store.
+
+        Resumed sessions keep the emojis entered so far and their remaining
+        timeouts, then invoke like normal. The ``check`` a session was
+        started with isn't saved, so resumed sessions don't have one.
+
+        Returns
+        -------
+        :class:`int`
+            The number of stored sessions that were resumed or cleaned up.
+        """
+        writer = self._session_writer()
+        if writer is None:
+            return 0
+        shard_ids = getattr(self, 'shard_ids', None)
+        now = time.time()
+        handled = 0
+        for record in await writer.load():
+            key = record.key
+            if key in self._resuming:
+                continue
+            if shard_ids is not None and self._reaction_shard_id(record.guild_id) not in shard_ids:
+                # another process runs this shard
+                continue
+            if self._sessions_for(record.guild_id).router.sessions(*key):
+                continue
+            self._resuming.add(key)
+            expires = record.expires_at()
+            if expires is not None and expires <= now:
+                self.loop.create_task(self._clean_stored_session(record))
+            else:
+                self.loop.create_task(self._resume_stored_session(record))
+            handled += 1
+        return handled
+
+    def _session_writer(self):
+        """Returns the :class:`_StoreWriter` for :attr:`session_store`, or
+        ``None`` if there's no store.
+        """
+        store = self.session_store
+        if store is None:
+            return None
+        writer = self._store_writer
+        if writer is None or writer.store is not store:
+            writer = self._store_writer = _StoreWriter(store)
+        return writer
+
+    async def close(self):
+        writer = self._store_writer
+        if writer is not None:
+            try:
+                await writer.flush()
+            except Exception:
+                if self._debug_:
+                    traceback.print_exc()
+        await super().close()
+
+    def _stored_session_context(self, record):
+        payload = ProxyPayload(message_id=record.message_id,
+                               channel_id=record.channel_id,
+                               guild_id=record.guild_id,
+                               user_id=record.user_id,
+                               emoji=discord.PartialEmoji.from_str(record.prefix),
+                               event_type='REACTION_ADD')
+        author, channel, guild = self._create_proxies(payload)
+        message = channel.get_partial_message(record.message_id)
+        ctx = ReactionContext(self, payload, author=author, message=message, prefix=record.prefix)
+        ctx.listening_emoji = record.listening_emoji
+        users = {self.user.id: self.user, author.id: author}
+        ctx.remove_after = [(emoji, users.get(user_id) or discord.Object(user_id))
+                            for emoji, user_id in record.remove_after]
+        return ctx
+
+    async def _clean_stored_session(self, record):
+        """Removes the reactions of a stored session that expired."""
+        try:
+            if self.remove_reactions_after:
+                ctx = self._stored_session_context(record)
+                try:
+                    can_remove = ctx.channel.permissions_for(ctx.me).manage_messages
+                except:
+                    can_remove = False
+                removals = []
+                for emoji, user in ctx.remove_after:
+                    if user == self.user:
+                        # still used by sessions running on the message
+                        if (record.message_id, emoji) not in self._listening_emojis:
+                            removals.append((emoji, user))
+                    elif can_remove:
+                        removals.append((emoji, user))
+                if removals:
+                    await self._remove_reactions(ctx.message, removals, can_manage=can_remove)
+            writer = self._session_writer()
+            if writer is not None:
+                writer.delete(*record.key)
+        except Exception:
+            if self._debug_:
+                traceback.print_exc()
+        finally:
+            self._resuming.discard(record.key)
+
+    async def _resume_stored_session(self, record):
+        """Runs a stored session from where it stopped and invokes it."""
+        limits = self.session_limits
+        acquired = False
+        try:
+            ctx = self._stored_session_context(record)
+            sessions = self._sessions_for(record.guild_id)
+            # checked before acquire so a dropped session doesn't use up limits
+            if sessions.guard.check(ctx):
+                if limits is not None:
+                    if not await limits.acquire(ctx):
+                        # over the limits, drop it like an expired session
+                        self._resuming.discard(record.key)
+                        return await self._clean_stored_session(record)
+                    acquired = True
+                timeout = None if record.deadline is None else max(0, record.deadline - time.time())
+                claimed = sessions.guard.claim(ctx, timeout)
+            else:
+                claimed = False
+            if not claimed:
+                # user started another session since, drop this one
+                sessions.rejected += 1
+                self._resuming.discard(record.key)
+                return await self._clean_stored_session(record)
+            sessions.started += 1
+            if (ctx.listening_emoji, self.user) in ctx.remove_after:
+                self._adopt_listening_emoji(record.message_id, ctx.listening_emoji)
+            await self._listen_and_resolve(ctx, record=record)
+        except Exception:
+            if self._debug_:
+                traceback.print_exc()
+            return
+        finally:
+            if acquired:
+                limits.release(ctx)
+            self._resuming.discard(record.key)
+        await self.invoke(ctx)
+
     async def on_raw_reaction_add(self, payload):
         await self.process_raw_reaction_commands(payload)
 
+    def _message_index(self):
+        """Returns the message cache, swapping it for an
+        :class:`_IndexedMessageDeque` if discord.py replaced it, like it does
+        on reconnect or when a guild is removed.
+        """
+        state = self._connection
+        messages = state._messages
+        if messages is None or isinstance(messages, _IndexedMessageDeque):
+            return messages
+        messages = state._messages = _IndexedMessageDeque(messages, maxlen=messages.maxlen)
+        return messages
+
     def _get_message(self, message_id, *, reverse=True):
-        """Searches :attr:`.cached_messages` for a message with id
-        ``message_id``.
+        """Gets a message with id ``message_id`` from :attr:`.cached_messages`.
 
         Parameters
         ----------
         message_id: :class:`int`
-            id of the message to search for
+            id of the message to get
         reverse: :class:`bool`
-            Whether it should search reversed (newest first). Default value is
-            ``True``
+            Kept for compatibility, messages are looked up by id so search
+            order doesn't matter anymore.
 
         Returns
         -------
         Optional[:class:`discord.Message`]
             The message or ``None``
         """
-        messages = self.cached_messages if not reverse else reversed(self.cached_messages)
-        return discord.utils.get(messagess, id=message_id) if self._connection._messages else None
+        messages = self._message_index()
+        return messages.get(message_id) if messages is not None else None
 
     async def _get_x_emoji(self, payload, *, attr, single=False):
-        emoji = ret = getattr(self, attr)
+        ret = (await self._resolve_x_emoji(payload, attr=attr, single=single))[0]
+        # don't hand out the cached list
+        return ret if ret is None or isinstance(ret, str) else list(ret)
+
+    async def _resolve_x_emoji(self, payload, *, attr, single=False):
+        """Gets ``attr`` and the frozenset of its emojis for lookups. Both
+        are cached together, for as long as ``emoji_cache_ttl`` if ``attr``
+        is callable.
+        """
+        emoji = getattr(self, attr)
+        if callable(emoji):
+            ttl = self.emoji_cache_ttl
+            cache = self._sessions_for(payload.guild_id).emoji_cache
+            # guild and channel ids can't collide
+            key = (attr, payload.guild_id or payload.channel_id)
+        else:
+            ttl = float('inf')
+            cache = self._emoji_cache
+            key = (attr, None)
+
+        if ttl is not None:
+            cached = cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+        ret = emoji
         if callable(emoji):
             ret = await discord.utils.maybe_coroutine(emoji, self, payload)
 
-        if not isinstance(ret, str):
-            if single:
-                raise TypeError(f"{attr} must be plain string, or None"
+        if single:
+            if ret is not None and not isinstance(ret, str):
+                raise TypeError(f"{attr} must be plain string, None, or callable "
                                 f"returning either of these, not {ret.__class__.__name__}")
+            emojis = frozenset() if ret is None else frozenset((ret,))
+        elif isinstance(ret, str):
+            emojis = frozenset((ret,))
+        else:
             try:
                 ret = list(ret)
             except TypeError:
@@ -95,9 +593,59 @@ class ReactionBotMixin(ReactionGroupMixin):
                                 f"returning either of these, not {ret.__class__.__name__}")
 
             if not ret:
-                raise ValueError(f"Iterable {name} must contain at least one prefix")
+                raise ValueError(f"Iterable {attr} must contain at least one prefix")
+            emojis = frozenset(ret)
+
+        if ttl is not None:
+            cache[key] = (time.monotonic() + ttl, (ret, emojis))
+        return ret, emojis
+
+    async def _get_prefix_emojis(self, payload):
+        """Frozenset of the prefix emojis for ``payload``, from
+        :meth:`get_prefix_emoji` if it's overridden.
+        """
+        if type(self).get_prefix_emoji is ReactionBotMixin.get_prefix_emoji:
+            return (await self._resolve_x_emoji(payload, attr='prefix_emoji'))[1]
+        prefix_emoji = await self.get_prefix_emoji(payload)
+        if isinstance(prefix_emoji, str):
+            return frozenset((prefix_emoji,))
+        return frozenset(prefix_emoji)
+
+    def _invalidate_emoji_cache(self, attr, id=None):
+        caches = [self._emoji_cache]
+        caches.extend(sessions.emoji_cache for sessions in self._shard_sessions.values())
+        for cache in caches:
+            if id is None:
+                for key in [key for key in cache if key[0] == attr]:
+                    del cache[key]
+            else:
+                cache.pop((attr, id), None)
+
+    def invalidate_prefix_cache(self, guild_id=None):
+        """Removes cached results of a callable :attr:`prefix_emoji`.
 
-        return ret
+        Only does anything if ``emoji_cache_ttl`` was passed. Call this after
+        changing the prefix emojis your callable returns.
+
+        Parameters
+        ----------
+        guild_id: Optional[:class:`int`]
+            Guild id, or channel id for DMs, to remove the cached prefix emojis
+            for. Removes everything if ``None``. Default value is ``None``.
+        """
+        self._invalidate_emoji_cache('prefix_emoji', guild_id)
+
+    def invalidate_listening_cache(self, guild_id=None):
+        """Same as :meth:`invalidate_prefix_cache` but for a callable
+        :attr:`listening_emoji`.
+
+        Parameters
+        ----------
+        guild_id: Optional[:class:`int`]
+            Guild id, or channel id for DMs, to remove the cached listening emoji
+            for. Removes everything if ``None``. Default value is ``None``.
+        """
+        self._invalidate_emoji_cache('listening_emoji', guild_id)
 
     async def get_prefix_emoji(self, payload):
         """Method that gets the :attr:`.ReactionBot.prefix_emoji` or list of
@@ -117,8 +665,7 @@ class ReactionBotMixin(ReactionGroupMixin):
         Returns
         -------
         Union[:class:`list`, :class:`str`]
-            A list of emojis, or single emoji that the bot is
-            listening for.
+            The emoji or list of emojis that the bot is listening for.
         """
         return await self._get_x_emoji(payload, attr='prefix_emoji')
 
@@ -163,15 +710,9 @@ class ReactionBotMixin(ReactionGroupMixin):
         cls:
             The class that will be used for the context.
         check: Optional[Callable[:class:`discord.RawReactionActionEvent`]]
-            Check that will be passed to :meth:`~discord.ext.commands.Bot.wait_for`.
-            Default check is equivalent to:
-
-            .. code-block:: python
-
-                def check(payload: discord.RawReactionActionEvent):
-                    same_msg = payload.message_id == ctx.message.id
-                    same_user =  payload.user_id == ctx.author.id
-                    return same_msg and same_user
+            Extra check for reactions during the listening session. Only
+            reactions on ``ctx.message`` by ``ctx.author`` are passed to it,
+            since those are the only reactions routed to the session.
 
             .. note::
 
@@ -182,8 +723,10 @@ class ReactionBotMixin(ReactionGroupMixin):
         :class:`~.reactioncommands.ReactionContext`
             The context to invoke.
         """
+        received = time.perf_counter()
         payload = ProxyPayload.from_reaction_user(reaction, user, event_type=event_type)
         ctx = cls(self, payload, author=user, message=reaction.message)
+        ctx._received_at = received
         return await self._start_ctx_session(ctx, check=check)
 
     async def get_raw_reaction_context(self, payload, *, cls=ReactionContext, check=None):
@@ -209,26 +752,22 @@ class ReactionBotMixin(ReactionGroupMixin):
         cls:
             The class that will be used for the context.
         check: Optional[Callable[:class:`discord.RawReactionActionEvent`]]
-            Check that will be passed to :meth:`~discord.ext.commands.Bot.wait_for`.
-            Default check is equivalent to:
-
-            .. code-block:: python
-
-                def check(payload: discord.RawReactionActionEvent):
-                    same_msg = payload.message_id == ctx.message.id
-                    same_user =  payload.user_id == ctx.author.id
-                    return same_msg and same_user
+            Extra check for reactions during the listening session. Only
+            reactions on ``ctx.message`` by ``ctx.author`` are passed to it,
+            since those are the only reactions routed to the session.
 
         Returns
         -------
         :class:`~.reactioncommands.ReactionContext`
             The context to invoke.
         """
-
+        received = time.perf_counter()
         author, channel, guild = self._create_proxies(payload)
         message = channel.get_partial_message(payload.message_id)
 
         ctx = cls(self, payload, author=author, message=message)
+        ctx._received_at = received
+        self._record_stage(ctx, 'create_proxies')
         return await self._start_ctx_session(ctx, check=check)
 
     async def process_raw_reaction_commands(self, payload):
@@ -243,16 +782,23 @@ class ReactionBotMixin(ReactionGroupMixin):
             or use :meth:`discord.ext.commands.Bot.event` to overwrite,
             don't forget to add this so reaction commands will still work.
 
+        Reactions that aren't a prefix emoji or a command with
+        :attr:`~.ReactionCommand.invoke_without_prefix` are ignored before
+        any context is created, unless :attr:`prefix_emoji` is callable.
+
         Parameters
         ----------
         payload: :class:`discord.RawReactionActionEvent`
             Payload to get context and invoke from.
         """
+        if not self._is_reaction_trigger(payload.emoji):
+            return
         author = payload.member or self.get_user(payload.user_id)
         if author and author.bot:
             return
         context = await self.get_raw_reaction_context(payload)
         await self.invoke(context)
+        self._record_stage(context, 'invoke')
 
     async def process_reaction_commands(self, reaction, user):
         """Gets context and invokes from a reaction and user. Gets arguments from
@@ -267,10 +813,21 @@ class ReactionBotMixin(ReactionGroupMixin):
         user: Union[:class:`discord.Member`, :class:`discord.User`]
             The user who added the reaction
         """
-        if user.bot:
+        if user.bot or not self._is_reaction_trigger(reaction.emoji):
             return
         context = await self.get_reaction_context(reaction, user)
         await self.invoke(context)
+        self._record_stage(context, 'invoke')
+
+    def _record_stage(self, ctx, stage):
+        """Sends the time since ``ctx``'s reaction was received to
+        :attr:`metrics_sink`, if there is one.
+        """
+        sink = self.metrics_sink
+        if sink is not None:
+            received = getattr(ctx, '_received_at', None)
+            if received is not None:
+                sink.record(stage, time.perf_counter() - received, ctx)
 
     def _create_proxies(self, payload):
         """Gets relevant ctx attributes from cache or creates
@@ -308,8 +865,8 @@ class ReactionBotMixin(ReactionGroupMixin):
         ----------
         ctx: :class:`~discord.ext.reactioncommands.ReactionContext`
             the context to fill out
-        check: Callable
-            check to be passed to :meth:`~discord.commands.ext.Bot.wait_for`
+        check: Optional[Callable]
+            extra check for reactions routed to the session
 
         Returns
         -------
@@ -317,97 +874,191 @@ class ReactionBotMixin(ReactionGroupMixin):
             returns the ctx that was passed in with attributes filled out
         """
         maybe_prefix = str(ctx.payload.emoji)
-        prefix_emoji = await self.get_prefix_emoji(ctx.payload)
+        prefix_emojis = await self._get_prefix_emojis(ctx.payload)
+        self._record_stage(ctx, 'prefix')
 
-        if (maybe_prefix == prefix_emoji or
-                (isinstance(prefix_emoji, list) and maybe_prefix in prefix_emoji)):
+        if maybe_prefix in prefix_emojis:
             ctx.prefix = maybe_prefix
         else:
             # try to check if it's a command
             # that can be invoked without prefix
             if await self.reaction_before_processing(ctx, check_only=True):
                 self._early_invoke(ctx, maybe_prefix)
+                self._record_stage(ctx, 'resolve')
+            return ctx
+        sessions = self._sessions_for(ctx.payload.guild_id)
+        if not sessions.guard.check(ctx):
+            # already listening, don't use up cooldowns or session limits
+            sessions.rejected += 1
+            return ctx
+        cooldown = self.session_cooldown
+        if cooldown is not None:
+            retry_after = cooldown.update_rate_limit(ctx)
+            if retry_after is not None:
+                sessions.rejected += 1
+                self.dispatch('reaction_cooldown', ctx, retry_after)
+                return ctx
+        limits = self.session_limits
+        if limits is not None and not await limits.acquire(ctx):
             return ctx
         try:
             if not await self.reaction_before_processing(ctx):
                 return ctx
-            self._active_ctx_sessions[ctx.message.id] += 1
-            try:
-                emojis = await asyncio.wait_for(self._wait_for_emoji_stream(ctx, check=check),
-                                                timeout=self.listen_total_timeout)
-            except asyncio.TimeoutError:
-                emojis = ''
-
-            self._active_ctx_sessions[ctx.message.id] -= 1
-
-            self.loop.create_task(self.reaction_after_processing(ctx))
-
-            ctx.view = commands.view.StringView(emojis)
-            ctx.full_emojis = emojis
-            ctx.view.skip_ws()
-            invoker = ctx.view.get_word()
-            ctx.invoked_with = invoker
-            ctx.command = self.get_reaction_command(invoker)
+            self._record_stage(ctx, 'before_processing')
+            await self._listen_and_resolve(ctx, check=check)
         except Exception as e:
             if self._debug_:
                 traceback.print_exc()
+        finally:
+            if limits is not None:
+                limits.release(ctx)
         return ctx
 
-    async def _wait_for_emoji_stream(self, ctx, *, check=None):
+    async def _listen_and_resolve(self, ctx, *, check=None, record=None):
+        try:
+            emojis = await self._wait_for_emoji_stream(ctx, check=check, record=record)
+        finally:
+            # cleanup runs even if listening failed
+            self.loop.create_task(self.reaction_after_processing(ctx))
+
+        ctx.full_emojis = emojis
+        self._resolve_reaction_invoke(ctx, emojis)
+        self._record_stage(ctx, 'resolve')
+
+    @staticmethod
+    def _wall_deadline(timeout):
+        return None if timeout is None else time.time() + timeout
+
+    def _session_record(self, ctx):
+        """Checkpoint of a session that's starting to listen on ``ctx``."""
+        return SessionRecord(message_id=ctx.message.id,
+                             channel_id=ctx.payload.channel_id,
+                             guild_id=ctx.payload.guild_id,
+                             user_id=ctx.author.id,
+                             prefix=ctx.prefix,
+                             listening_emoji=ctx.listening_emoji,
+                             deadline=self._wall_deadline(self.listen_total_timeout),
+                             idle_deadline=self._wall_deadline(self.listen_timeout),
+                             remove_after=[(str(emoji), user.id) for emoji, user in ctx.remove_after])
+
+    async def _wait_for_emoji_stream(self, ctx, *, check=None, record=None):
         """Helper method to listen to reactions added by a user and join them
         together into a string
 
+        Reactions on ``ctx.message`` by ``ctx.author`` are routed here by
+        :meth:`dispatch`. Stops after :attr:`listen_timeout` seconds without
+        a reaction, or :attr:`listen_total_timeout` seconds in total. With
+        :attr:`complete_on_leaf` it also stops once the emojis can only be one
+        command without subcommands.
+
         Parameters
         ----------
         ctx: :class:`~discord.ext.reactioncommands.ReactionContext`
             ctx that started this listening
-        check: Callable
-            check to be passed to ``wait_for` that listens to
-            ``raw_reaction_add`` and ``raw_reaction_remove``
+        check: Optional[Callable]
+            extra check for ``raw_reaction_add`` and ``raw_reaction_remove``
+            payloads routed to this session
+        record: Optional[:class:`.SessionRecord`]
+            checkpoint of a session to resume, its emojis and deadlines are
+            used instead of starting over
 
         Returns
         -------
         :class:`str`
-            emojis joined together
+            emojis joined together, or empty if :attr:`listen_total_timeout`
+            was reached
         """
-        if not check:
-            def check(payload):
-                return payload.message_id == ctx.message.id and payload.user_id == ctx.author.id
-        command = []
-
+        key = (ctx.message.id, ctx.author.id)
+        store = self._session_writer()
+        total_timeout = self.listen_total_timeout
+        idle_timeout = self.listen_timeout
+        first_idle_timeout = None
+        if record is not None:
+            now = time.time()
+            if record.deadline is not None:
+                total_timeout = max(0, record.deadline - now)
+            if record.idle_deadline is not None:
+                first_idle_timeout = max(0, record.idle_deadline - now)
+        elif store is not None:
+            record = self._session_record(ctx)
+
+        session = _ListeningSession(self.loop, ctx, check=check,
+                                    idle_timeout=idle_timeout,
+                                    total_timeout=total_timeout,
+                                    first_idle_timeout=first_idle_timeout)
+        router = self._sessions_for(ctx.payload.guild_id).router
+        cursor = _TrieCursor(self) if self.complete_on_leaf else None
+        mode = self.reaction_remove_mode
+        command = _EmojiBuffer()
+        if record is not None:
+            for emoji in record.emojis:
+                command.append(emoji)
+                if cursor is not None:
+                    cursor.feed(emoji)
+        if store is not None:
+            store.save(record)
+            # not deleted if listening is interrupted, so it can be resumed
+            ctx._checkpointed = True
+        with router.listen(key, session):
+            emojis = await self._read_emoji_stream(ctx, session, command, cursor, mode, record, store)
+        if store is not None:
+            store.delete(*key)
+            ctx._checkpointed = False
+        return emojis
+
+    async def _read_emoji_stream(self, ctx, session, command, cursor, mode, record, store):
         while True:
-            tasks = (self.wait_for('raw_reaction_add', check=check),
-                     self.wait_for('raw_reaction_remove', check=check))
-            done, pending = await asyncio.wait([asyncio.create_task(t) for t in tasks],
-                                               timeout=self.listen_timeout,
-                                               return_when=asyncio.FIRST_COMPLETED)
-            if done:
-                #user reacted
-                result = done.pop()
-                self._cleanup_reaction_tasks(done, pending)
-                try:
-                    payload = result.result()
-                except Exception as e:
-                    if self._debug_:
-                        print(e)
+            payload = await session.next_payload()
+            if payload is None:
+                if session.expired in ('total', 'cancelled'):
                     return ''
-                emoji = str(payload.emoji)
-                if emoji == ctx.prefix:
-                    if command:
-                        return ''.join(command)
-                    else:
-                        return ''
-                elif emoji == ctx.listening_emoji:
-                    command.append(' ')
-                else:
-                    command.append(emoji)
-            else:
                 #user stopped reacting, check if any reactions
-                self._cleanup_reaction_tasks(done, pending)
-                if command:
-                    return ''.join(command)
+                return str(command)
+            self._record_stage(ctx, 'emoji')
+            emoji = str(payload.emoji)
+            if emoji == ctx.prefix:
+                return str(command)
+            elif emoji == ctx.listening_emoji:
+                emoji = ' '
+
+            removed = False
+            if getattr(payload, 'event_type', None) == 'REACTION_REMOVE' and mode != 'append':
+                if mode == 'toggle' and command.last() != emoji:
+                    # toggle only takes back the last emoji
+                    continue
+                if not command.remove(emoji):
+                    # wasn't added in this session, nothing to undo
+                    continue
+                removed = True
+            else:
+                command.append(emoji)
+            if store is not None:
+                record.emojis = list(command)
+                record.idle_deadline = self._wall_deadline(self.listen_timeout)
+                store.save(record)
+
+            if cursor is not None:
+                if removed:
+                    cursor.rewind(command)
                 else:
-                    return ''
+                    cursor.feed(emoji)
+                if cursor.leaf() is not None:
+                    # nothing else could change the command
+                    return str(command)
+
+    def _resolve_reaction_invoke(self, ctx, emojis):
+        """Finds the command and subcommands for ``emojis`` and sets
+        the related ctx attributes. Unmatched emojis are left in ``ctx.view``.
+        """
+        path, rest = self._walk_reaction_trie(emojis.lstrip())
+        if path:
+            ctx.invoked_with, ctx.command = path.pop(0)
+        else:
+            words = emojis.split(maxsplit=1)
+            ctx.invoked_with = words[0] if words else ''
+            ctx.command = None
+        ctx._reaction_path = deque(path)
+        ctx.view = commands.view.StringView(rest)
 
     def _early_invoke(self, ctx, emoji):
         """Checks if user reacted for a command that can be invoked without
@@ -429,17 +1080,11 @@ class ReactionBotMixin(ReactionGroupMixin):
             return True
         return False
 
-    def _cleanup_reaction_tasks(self, done, pending):
-        # cleanup tasks from emoji waiting
-        for future in (done or []):
-            future.exception()
-        for future in (pending or []):
-            future.cancel()
-
     async def reaction_before_processing(self, ctx, *, check_only=False):
         """Method that is called after verifying the prefix emoji and before
         the command input is added by the user. Determines if the bot should
-        listen to reactions. :attr:`.ReactionBot.listening_emoji` is added here.
+        listen to reactions. :attr:`.ReactionBot.listening_emoji` is added here,
+        once per message no matter how many sessions are listening on it.
 
         .. note::
             This method prevents users from starting multiple listening sessions
@@ -460,26 +1105,79 @@ class ReactionBotMixin(ReactionGroupMixin):
          :class:`bool`
             Whether the bot should continue listening for reactions or not.
         """
-        try:
-            await self._mc.acquire(ctx)
-        except commands.MaxConcurrencyReached:
+        sessions = self._sessions_for(ctx.payload.guild_id)
+        if check_only:
+            return sessions.guard.check(ctx)
+        if not sessions.guard.claim(ctx, self.listen_total_timeout):
+            sessions.rejected += 1
             return False
-        else:
-            if check_only:
-                await self._mc.release(ctx)
-                return True
+        sessions.started += 1
 
         listening_emoji = await self.get_listening_emoji(ctx.payload)
         ctx.listening_emoji = listening_emoji
         if listening_emoji is not None:
             try:
-                await ctx.message.add_reaction(listening_emoji)
-                ctx.remove_after.append((listening_emoji, ctx.me))
+                await self._acquire_listening_emoji(ctx.message, listening_emoji)
+                self._record_stage(ctx, 'listening_emoji')
+                ctx.remove_after.append((listening_emoji, self.user))
             except Exception as e:
                 if self._debug_:
                     print('failed adding listening emoji', e)
         return True
 
+    async def _acquire_listening_emoji(self, message, emoji):
+        """Adds the listening emoji to ``message`` for one more session. Only
+        the first session adds it, the others wait on the same request.
+        Sessions that got it have to call :meth:`_release_listening_emoji`.
+        """
+        key = (message.id, str(emoji))
+        ref = self._listening_emojis.get(key)
+        if ref is None:
+            pending = self._pending_cleanups.get(message.id)
+            if pending is not None and pending.removals.pop((key[1], self.user.id), None):
+                # last session just ended and it wasn't removed yet, keep it
+                added = self.loop.create_future()
+                added.set_result(None)
+            else:
+                added = self.loop.create_task(message.add_reaction(emoji))
+            ref = self._listening_emojis[key] = _ListeningEmojiRef(added)
+        try:
+            await asyncio.shield(ref.added)
+        except Exception:
+            if self._listening_emojis.get(key) is ref:
+                del self._listening_emojis[key]
+            raise
+        ref.sessions += 1
+
+    def _adopt_listening_emoji(self, message_id, emoji):
+        """Counts a resumed session whose listening emoji is already on the
+        message, without adding it again.
+        """
+        key = (message_id, str(emoji))
+        ref = self._listening_emojis.get(key)
+        if ref is None:
+            added = self.loop.create_future()
+            added.set_result(None)
+            ref = self._listening_emojis[key] = _ListeningEmojiRef(added)
+        pending = self._pending_cleanups.get(message_id)
+        if pending is not None:
+            pending.removals.pop((key[1], self.user.id), None)
+        ref.sessions += 1
+
+    def _release_listening_emoji(self, message_id, emoji):
+        """Returns whether this was the last session using the listening
+        emoji, and it should be removed.
+        """
+        key = (message_id, str(emoji))
+        ref = self._listening_emojis.get(key)
+        if ref is None:
+            return True
+        ref.sessions -= 1
+        if ref.sessions > 0:
+            return False
+        del self._listening_emojis[key]
+        return True
+
     async def reaction_after_processing(self, ctx):
         """Method that is called after verifying the command and before checks,
         ``@before_invoke``, and command invoke. If :attr:`.ReactionBot.remove_reactions_after`
@@ -495,28 +1193,89 @@ class ReactionBotMixin(ReactionGroupMixin):
         ctx: :class:`~.reactioncommands.ReactionContext`
             Context that will be invoked.
         """
-        await self._mc.release(ctx)
-        if self.remove_reactions_after:
+        self._sessions_for(ctx.payload.guild_id).guard.release(ctx)
+        # the listening emoji stays until the last session on the message ends
+        last_listening = ((ctx.listening_emoji, self.user) in ctx.remove_after and
+                          self._release_listening_emoji(ctx.message.id, ctx.listening_emoji))
+        # interrupted with its record kept, the reactions stay until it's
+        # resumed or cleaned up by resume_reaction_sessions
+        if self.remove_reactions_after and not ctx._checkpointed:
             try:
                 can_remove = ctx.channel.permissions_for(ctx.me).manage_messages
             except:
                 if self._debug_:
                     print('Error getting permissions in', ctx.channel)
                 can_remove = False
+            removals = []
             for emoji, user in ctx.remove_after:
+                if user == self.user:
+                    if emoji != ctx.listening_emoji or last_listening:
+                        removals.append((emoji, self.user))
+                elif can_remove:
+                    removals.append((emoji, user))
+            if removals:
+                await self._remove_reactions(ctx.message, removals, can_manage=can_remove)
+        self._record_stage(ctx, 'after_processing')
+
+    async def _remove_reactions(self, message, removals, *, can_manage):
+        """Queues ``(emoji, user)`` pairs to be removed from ``message``.
+
+        Removals from every session on the same message that end before the
+        queue is flushed are done together. Waits until they're done.
+        """
+        pending = self._pending_cleanups.get(message.id)
+        if pending is None:
+            pending = self._pending_cleanups[message.id] = _PendingCleanup(message, can_manage)
+            pending.task = self.loop.create_task(self._flush_reaction_cleanup(message.id))
+        pending.can_manage = pending.can_manage and can_manage
+        for emoji, user in removals:
+            pending.removals[(str(emoji), user.id)] = user
+        await asyncio.shield(pending.task)
+
+    async def _flush_reaction_cleanup(self, message_id):
+        # let other sessions ending on this message join in
+        await asyncio.sleep(0)
+        pending = self._pending_cleanups.pop(message_id)
+        semaphore = asyncio.Semaphore(_CLEANUP_CONCURRENCY)
+
+        async def run(coro):
+            async with semaphore:
                 try:
-                    if user == self.user:
-                        if not (emoji == ctx.listening_emoji and self._active_ctx_sessions[ctx.message.id]):
-                            await ctx.message.remove_reaction(emoji, self.user)
-                    elif can_remove:
-                        await ctx.message.remove_reaction(emoji, user)
-                except discord.HTTPException:
-                    pass
-            if not self._active_ctx_sessions[ctx.message.id]:
-                try:
-                    del self._active_ctx_sessions[ctx.message.id]
-                except KeyError:
-                    pass
+                    await coro
+                except discord.HTTPException as e:
+                    if self._debug_:
+                        print('failed removing reactions', e)
+
+        await asyncio.gather(*map(run, self._plan_reaction_cleanup(pending)))
+
+    def _plan_reaction_cleanup(self, pending):
+        """Picks the fewest HTTP calls that remove all pending reactions.
+
+        Cached reactions only have a count, not who reacted, so the bot only
+        knows everyone is being removed for emojis only it reacted with. If
+        the cached message has nothing else, ``clear_reactions`` is used
+        instead of removing each reaction. Otherwise every user's reaction is
+        removed on its own, so reactions of other users and other sessions
+        are left alone.
+        """
+        message = pending.message
+        by_emoji = {}
+        for (emoji, _), user in pending.removals.items():
+            by_emoji.setdefault(emoji, []).append(user)
+
+        # ctx.message is a PartialMessage, the cached one has the reactions
+        cached = self._get_message(message.id)
+        reactions = getattr(cached, 'reactions', None)
+        if pending.can_manage and reactions:
+            me = self.user.id
+            if all(reaction.me and reaction.count == 1 and
+                   any(user.id == me for user in by_emoji.get(str(reaction.emoji), ()))
+                   for reaction in reactions):
+                return [message.clear_reactions()]
+
+        return [message.remove_reaction(emoji, user)
+                for emoji, users in by_emoji.items()
+                for user in users]
 
 
 class ReactionBot(ReactionBotMixin, commands.Bot):
@@ -555,9 +1314,65 @@ class ReactionBot(ReactionBotMixin, commands.Bot):
         remove_reactions_after: Optional[:class:`bool`]
             Whether the bot should remove its own reactions.
             Default value is ``True``.
+        emoji_cache_ttl: Optional[:class:`float`]
+            Time in seconds to cache the result of a callable :attr:`prefix_emoji`
+            or :attr:`listening_emoji` per guild, or per channel for DMs. Use
+            :meth:`invalidate_prefix_cache` and :meth:`invalidate_listening_cache`
+            to clear it early. Pass ``None`` to call them on every reaction.
+            Default value is ``None``.
+
+            .. warning::
+                The first result in a guild is reused for every payload in
+                that guild, so only set this if your callables return the
+                same thing for the whole guild, not per user or channel.
+        metrics_sink: Optional[Union[:class:`.HistogramSink`, :class:`Callable`]]
+            Receives the time in seconds from a reaction being received to each
+            stage of handling it. Can be :class:`.CallbackSink`,
+            :class:`.HistogramSink`, :class:`.PrometheusFileSink`, any object
+            with a ``record(stage, elapsed, ctx)`` method, or a callable taking
+            the same arguments. Stages are ``create_proxies``, ``prefix``,
+            ``before_processing``, ``listening_emoji``, ``emoji`` (once for each
+            reaction in the session), ``resolve``, ``invoke``, and
+            ``after_processing``. Default value is ``None``.
+        session_scope: :class:`.SessionScope`
+            How many listening sessions a user can have at once, per shard.
+            Claims expire on their own shortly after :attr:`listen_total_timeout`.
+            Default value is :attr:`.SessionScope.user`.
+        reaction_remove_mode: :class:`str`
+            What removing a reaction does while listening. ``'undo'`` removes
+            the last time that emoji was added, and ignores it if the emoji
+            wasn't added in this session (like a reaction from before the
+            prefix). ``'toggle'`` only undoes it if it was the last emoji
+            added and ignores any other removed emoji. ``'append'`` always
+            adds it again like adding a reaction does, so commands with
+            repeated emojis can be entered, but a reaction taken back by
+            mistake still ends up in the command. Default value is
+            ``'append'``.
+        complete_on_leaf: :class:`bool`
+            Whether to stop listening as soon as the emojis added can only be
+            one command that has no subcommands, instead of waiting for the
+            prefix to be removed or :attr:`listen_timeout`. Default value is
+            ``False``.
+        session_limits: Optional[:class:`.SessionLimits`]
+            Limits on concurrent sessions and how fast they start, and what
+            happens to sessions over the limits. Default value is ``None``.
+        session_store: Optional[:class:`.SessionStore`]
+            Where listening sessions are checkpointed after each reaction, so
+            they can be resumed after a reconnect or restart with
+            :meth:`resume_reaction_sessions` instead of being dropped. Writes
+            are batched and run in an executor, so reactions from the last
+            quarter second before a crash can be lost.
+            Default value is ``None``.
+        session_cooldown: Optional[:class:`.ReactionCooldown`]
+            Cooldown for starting listening sessions, checked when the prefix
+            emoji is added before :attr:`session_limits` and before the
+            listening emoji is added. Sessions on cooldown are ignored and
+            ``reaction_cooldown`` is dispatched with the context and seconds
+            until it's over. Default value is ``None``.
         emoji_insensitive: Optional[:class:`bool`]
-            Attempts to normalize emojis by removing different skin colored and
-            gendered modifiers when being invoked.
+            Attempts to normalize emojis by removing different skin colored,
+            gendered, and hair style modifiers when being invoked. See
+            :func:`~.utils.scrub_emojis`.
 
             Ex: 👍🏿/👍🏾/👍🏽/👍🏼/👍🏻 --> 👍
 
@@ -569,5 +1384,10 @@ class ReactionBot(ReactionBotMixin, commands.Bot):
 class AutoShardedReactionBot(ReactionBotMixin, commands.AutoShardedBot):
     """Sharded version of ReactionBot. IDK, probably works. Subclass of
     :class:`discord.ext.commands.AutoShardedBot`.
+
+    Listening sessions, session claims, and cached emojis are kept per shard.
+    When a shard starts a new gateway session only its own listening sessions
+    are dropped, see :meth:`~.ReactionBot.drop_shard_sessions` and
+    :meth:`~.ReactionBot.reaction_shard_stats`.
     """
     pass
@@ -0,0 +1,394 @@
+import os
+import json
+import signal
+import asyncio
+import tempfile
+import multiprocessing
+
+__all__ = ('ReactionCluster', 'ClusterError')
+
+
+def _split_shards(shard_count, processes):
+    """Splits ``range(shard_count)`` into ``processes`` contiguous ranges."""
+    size, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for i in range(processes):
+        end = start + size + (i < extra)
+        if end > start:
+            ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+class ClusterError(Exception):
+    """A request failed on the other end of a cluster connection."""
+    pass
+
+
+class _Connection:
+    """JSON lines over a Unix socket. Requests carry a ``nonce`` and
+    replies are matched to them by it. Replies have a ``result``, or an
+    ``error`` if the handler raised.
+    """
+
+    def __init__(self, reader, writer, handler):
+        self.reader = reader
+        self.writer = writer
+        self.handler = handler
+        self._nonce = 0
+        self._pending = {}
+        # running _reply tasks, kept so they aren't garbage collected
+        self._tasks = set()
+
+    def send(self, data):
+        self.writer.write(json.dumps(data).encode() + b'\n')
+
+    async def request(self, data):
+        self._nonce += 1
+        nonce = self._nonce
+        future = asyncio.get_running_loop().create_future()
+        self._pending[nonce] = future
+        try:
+            self.send({**data, 'nonce': nonce})
+            return await future
+        finally:
+            self._pending.pop(nonce, None)
+
+    async def listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                data = json.loads(line)
+                if 'op' not in data:
+                    future = self._pending.get(data.get('nonce'))
+                    if future is not None and not future.done():
+                        if 'error' in data:
+                            future.set_exception(ClusterError(data['error']))
+                        else:
+                            future.set_result(data.get('result'))
+                    continue
+                task = asyncio.ensure_future(self._reply(data))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('cluster connection closed'))
+            self.writer.close()
+
+    async def _reply(self, data):
+        try:
+            reply = {'result': await self.handler(data)}
+        except Exception as e:
+            reply = {'error': f'{type(e).__name__}: {e}'}
+        if 'nonce' in data:
+            self.send({'nonce': data['nonce'], **reply})
+
+    def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self.writer.close()
+
+
+def _merge_stats(results):
+    shards = {}
+    for result in results:
+        for shard_id, stats in result.items():
+            shards[int(shard_id)] = stats
+    total = {}
+    for stats in shards.values():
+        for key, value in stats.items():
+            total[key] = total.get(key, 0) + value
+    return {'shards': shards, 'total': total}
+
+
+class _ClusterWorker:
+    """IPC client for a bot running in a cluster worker, set as
+    ``bot.cluster``.
+
+    Attributes
+    ----------
+    worker_id: :class:`int`
+        Index of this worker.
+    shard_ids: list[:class:`int`]
+        Shards this worker runs.
+    """
+
+    def __init__(self, bot, worker_id, shard_ids):
+        self.bot = bot
+        self.worker_id = worker_id
+        self.shard_ids = shard_ids
+        self._connection = None
+        self._listener = None
+        self._closing = None
+
+    async def connect(self, path):
+        reader, writer = await asyncio.open_unix_connection(path)
+        self._connection = _Connection(reader, writer, self._handle)
+        self._connection.send({'op': 'hello', 'worker': self.worker_id})
+        self._listener = asyncio.ensure_future(self._connection.listen())
+
+    def shutdown(self):
+        """Starts closing the bot, which ends the worker."""
+        if self._closing is None:
+            self._closing = asyncio.ensure_future(self.bot.close())
+
+    async def close(self):
+        """Waits for the bot to finish closing if :meth:`shutdown` was
+        called, then disconnects from the cluster.
+        """
+        if self._closing is not None:
+            await self._closing
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _handle(self, data):
+        op = data['op']
+        if op == 'shutdown':
+            return self.shutdown()
+        elif op == 'cancel':
+            return self.bot.cancel_reaction_sessions(message_id=data.get('message_id'),
+                                                     user_id=data.get('user_id'))
+        elif op == 'stats':
+            return self.bot.reaction_shard_stats()
+        raise ValueError(f'unknown op {op!r}')
+
+    async def cancel_reaction_sessions(self, *, message_id=None, user_id=None):
+        """Stops matching listening sessions in every worker, see
+        :meth:`.ReactionBot.cancel_reaction_sessions`.
+
+        Returns
+        -------
+        :class:`int`
+            The number of sessions that were stopped across the cluster.
+        """
+        return await self._connection.request({'op': 'broadcast', 'request': {
+            'op': 'cancel', 'message_id': message_id, 'user_id': user_id
+        }})
+
+    async def stats(self):
+        """Gets listening session stats from every worker, see
+        :meth:`ReactionCluster.stats`.
+        """
+        stats = await self._connection.request({'op': 'broadcast', 'request': {'op': 'stats'}})
+        # json turns the shard ids into strings
+        stats['shards'] = {int(shard_id): shard for shard_id, shard in stats['shards'].items()}
+        return stats
+
+
+async def _worker_main(worker_id, shard_ids, shard_count, path, token, bot_factory, setup):
+    bot = bot_factory(shard_ids=shard_ids, shard_count=shard_count)
+    if setup is not None:
+        ret = setup(bot)
+        if asyncio.iscoroutine(ret):
+            await ret
+    bot.cluster = _ClusterWorker(bot, worker_id, shard_ids)
+    loop = asyncio.get_running_loop()
+    # Ctrl+C reaches every worker and terminate() sends SIGTERM, close the bot for both
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, bot.cluster.shutdown)
+    await bot.cluster.connect(path)
+    try:
+        await bot.start(token)
+    finally:
+        await bot.cluster.close()
+
+
+def _run_worker(*args):
+    try:
+        asyncio.run(_worker_main(*args))
+    except KeyboardInterrupt:
+        pass
+
+
+class ReactionCluster:
+    """Runs an :class:`.AutoShardedReactionBot` over multiple processes,
+    each running a range of shards.
+
+    Reaction commands are registered by ``setup`` in every worker so all of
+    them have the same commands. Workers talk to the cluster over a Unix
+    socket to cancel listening sessions and get stats across processes.
+    Workers are started with the ``spawn`` start method, so ``bot_factory``
+    and ``setup`` have to be defined at the top level of a module.
+
+    Inside a worker the bot has a ``cluster`` attribute with the coroutines
+    ``cancel_reaction_sessions`` and ``stats`` that run across the whole
+    cluster.
+
+    .. code-block:: python3
+
+        def make_bot(**kwargs):
+            return reactioncommands.AutoShardedReactionBot('!', '🤔', '👀', **kwargs)
+
+        def setup(bot):
+            bot.load_extension('cogs.reactions')
+
+        if __name__ == '__main__':
+            ReactionCluster(make_bot, token, shard_count=16, processes=4, setup=setup).run()
+
+    Parameters
+    ----------
+    bot_factory: Callable[..., :class:`.AutoShardedReactionBot`]
+        Creates the bot in each worker. Called with ``shard_ids`` and
+        ``shard_count`` keyword arguments.
+    token: :class:`str`
+        Bot token.
+    shard_count: :class:`int`
+        Total number of shards.
+    processes: Optional[:class:`int`]
+        Number of worker processes. Defaults to :func:`os.cpu_count`,
+        never more than ``shard_count``.
+    setup: Optional[Callable[[:class:`.AutoShardedReactionBot`], Any]]
+        Registers commands on the bot in each worker. Can be a coroutine.
+    socket_path: Optional[:class:`str`]
+        Path of the Unix socket. Defaults to a file in the temp directory.
+    """
+
+    def __init__(self, bot_factory, token, *, shard_count, processes=None, setup=None, socket_path=None):
+        self.bot_factory = bot_factory
+        self.token = token
+        self.shard_count = shard_count
+        self.shard_ranges = _split_shards(shard_count, min(processes or os.cpu_count() or 1, shard_count))
+        self.setup = setup
+        self.socket_path = socket_path or os.path.join(tempfile.gettempdir(),
+                                                       f'reactioncluster-{os.getpid()}.sock')
+        self.processes = []
+        self._workers = {}
+        # running _on_connect task -> its writer, one for each connection
+        self._connect_tasks = {}
+        self._server = None
+
+    async def _handle(self, data):
+        if data['op'] == 'broadcast':
+            results = await self._broadcast(data['request'])
+            if data['request']['op'] == 'stats':
+                return _merge_stats(results)
+            return sum(results)
+        raise ValueError(f"unknown op {data['op']!r}")
+
+    async def _on_connect(self, reader, writer):
+        task = asyncio.current_task()
+        self._connect_tasks[task] = writer
+        try:
+            await self._serve_worker(reader, writer)
+        finally:
+            self._connect_tasks.pop(task, None)
+
+    async def _serve_worker(self, reader, writer):
+        line = await reader.readline()
+        if not line:
+            writer.close()
+            return
+        worker_id = json.loads(line)['worker']
+        connection = self._workers[worker_id] = _Connection(reader, writer, self._handle)
+        try:
+            await connection.listen()
+        finally:
+            if self._workers.get(worker_id) is connection:
+                del self._workers[worker_id]
+
+    async def _broadcast(self, request):
+        results = await asyncio.gather(*(connection.request(request)
+                                         for connection in list(self._workers.values())),
+                                       return_exceptions=True)
+        # workers that failed or are gone are left out
+        return [result for result in results
+                if result is not None and not isinstance(result, BaseException)]
+
+    async def cancel_reaction_sessions(self, *, message_id=None, user_id=None):
+        """Stops matching listening sessions in every worker, see
+        :meth:`.ReactionBot.cancel_reaction_sessions`.
+
+        Returns
+        -------
+        :class:`int`
+            The number of sessions that were stopped.
+        """
+        return sum(await self._broadcast({'op': 'cancel', 'message_id': message_id, 'user_id': user_id}))
+
+    async def stats(self):
+        """Gets listening session stats from every connected worker.
+
+        Returns
+        -------
+        :class:`dict`
+            ``shards`` maps shard id to that shard's
+            :meth:`~.ReactionBot.reaction_shard_stats`, ``total`` is the sum of
+            every shard.
+        """
+        return _merge_stats(await self._broadcast({'op': 'stats'}))
+
+    async def start(self):
+        """Starts the IPC server and every worker, then waits until all
+        workers exit.
+        """
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._on_connect, self.socket_path)
+
+        spawn = multiprocessing.get_context('spawn')
+        for worker_id, shard_ids in enumerate(self.shard_ranges):
+            process = spawn.Process(target=_run_worker, name=f'reaction-cluster-{worker_id}', args=(
+                worker_id, shard_ids, self.shard_count, self.socket_path,
+                self.token, self.bot_factory, self.setup
+            ))
+            process.start()
+            self.processes.append(process)
+
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(*(loop.run_in_executor(None, process.join) for process in self.processes))
+        finally:
+            await self.close()
+
+    async def close(self, timeout=30.0):
+        """Stops every worker and the IPC server.
+
+        Workers are asked to close their bots first, then killed if they
+        haven't exited after ``timeout`` seconds.
+
+        Parameters
+        ----------
+        timeout: :class:`float`
+            Seconds to wait for workers to exit on their own.
+            Default value is ``30``.
+        """
+        loop = asyncio.get_running_loop()
+        for connection in list(self._workers.values()):
+            connection.send({'op': 'shutdown'})
+        alive = [process for process in self.processes if process.is_alive()]
+        await asyncio.gather(*(loop.run_in_executor(None, process.join, timeout) for process in alive))
+        alive = [process for process in alive if process.is_alive()]
+        for process in alive:
+            # SIGTERM only closes the bot again, which didn't finish in time
+            process.kill()
+        await asyncio.gather(*(loop.run_in_executor(None, process.join) for process in alive))
+
+        for connection in list(self._workers.values()):
+            connection.close()
+        # closing the writers ends the connection tasks, cancelling them makes
+        # asyncio.start_unix_server log the CancelledError
+        for writer in self._connect_tasks.values():
+            writer.close()
+        await asyncio.gather(*self._connect_tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def run(self):
+        """Blocking call that runs :meth:`start`."""
+        try:
+            asyncio.run(self.start())
+        except KeyboardInterrupt:
+            pass
@@ -1,6 +1,8 @@
 import discord
 from discord.ext import commands
 
+from .reactionexecutor import ReactionExecutor
+
 __all__ = ('ReactionContext',)
 
 class ReactionContext(commands.Context):
@@ -65,10 +67,42 @@ class ReactionContext(commands.Context):
         self.listening_emoji = None
         self.full_emojis = ''
         self.invoked_parents = []
+        # subcommands resolved from the emojis, used by ReactionGroup.invoke
+        self._reaction_path = None
+        # session is saved in the bot's session store and can be resumed
+        self._checkpointed = False
+        # time.perf_counter() when the reaction was received, for metrics
+        self._received_at = None
         # need to separate ctx.author from ctx.message.author
         # since they can be different users
         self.author = author
 
+    async def run_in_executor(self, func, *args, **kwargs):
+        """Runs blocking ``func(*args, **kwargs)`` in the command's
+        :class:`.ReactionExecutor`, or the shared thread pool if the command
+        doesn't have one. Everything else in the callback, like sending, stays
+        on the event loop.
+
+        .. code-block:: python3
+
+            @bot.reaction_command('🖼️', executor='process')
+            async def render(ctx):
+                data = await ctx.run_in_executor(render_image, ctx.author.id)
+                await ctx.send(file=discord.File(io.BytesIO(data), 'image.png'))
+
+        Raises
+        ------
+        :exc:`.ExecutorSaturated`
+            The executor's queue is full.
+
+        Returns
+        -------
+        Any
+            What ``func`` returned.
+        """
+        executor = getattr(self.command, 'executor', None) or ReactionExecutor.default('thread')
+        return await executor.run(func, *args, **kwargs)
+
     async def fetch(self):
         """Shortcut to :meth:`ctx.message.fetch() <discord.PartialMessage.fetch>`.
 
@@ -90,9 +124,9 @@ class ReactionContext(commands.Context):
         return self.message
 
     def get(self, *, reverse=True):
-        """Searches :attr:`Bot.cached_messages <discord.ext.commands.Bot.cached_messages>`
-        for a message where ``ctx.message.id == message.id``. Returns ``None``
-        if the message was not found.
+        """Gets the message with ``ctx.message.id`` from
+        :attr:`Bot.cached_messages <discord.ext.commands.Bot.cached_messages>`.
+        Returns ``None`` if the message was not found.
 
         If found, updates :attr:`.ReactionContext.message` with the message and
         returns it.
@@ -100,8 +134,7 @@ class ReactionContext(commands.Context):
         Parameters
         ----------
         reverse: :class:`bool`
-            Whether should search :func:`reversed` ``cached_messages`` (newest
-            messages first). Defaults to ``True``.
+            Kept for compatibility, the lookup is by id so this does nothing.
 
         Returns
         -------
@@ -0,0 +1,121 @@
+import time
+from enum import Enum
+
+__all__ = ('CooldownScope', 'ReactionCooldown')
+
+
+class CooldownScope(Enum):
+    """What a :class:`ReactionCooldown` bucket is kept for.
+
+    Attributes
+    ----------
+    user
+        Each user. The default.
+    guild
+        Each guild. DMs count per channel.
+    channel
+        Each channel.
+    message
+        Each message.
+    """
+    user = 0
+    guild = 1
+    channel = 2
+    message = 3
+
+    def get_key(self, ctx):
+        payload = ctx.payload
+        if self is CooldownScope.user:
+            return ctx.author.id
+        elif self is CooldownScope.guild:
+            return payload.guild_id or payload.channel_id
+        elif self is CooldownScope.channel:
+            return payload.channel_id
+        return payload.message_id
+
+
+class ReactionCooldown:
+    """Cooldown for reaction invokes, ``rate`` times every ``per`` seconds
+    for each key of ``scope``.
+
+    Passed as ``session_cooldown`` to :class:`.ReactionBot` it's checked when
+    a prefix emoji is added, before any requests are made for the session.
+    Passed as ``reaction_cooldown`` to a :class:`.ReactionCommand` it's
+    checked when the command is invoked from reactions, like
+    :func:`~discord.ext.commands.cooldown` is.
+
+    Each key only keeps one timestamp, the time its bucket is empty again
+    (GCRA), so buckets don't need to be refilled and old keys are dropped
+    once they're full.
+
+    Parameters
+    ----------
+    rate: :class:`int`
+        Invokes allowed every ``per`` seconds, all at once if there
+        weren't any for a while.
+    per: :class:`float`
+        Seconds for ``rate``.
+    scope: :class:`CooldownScope`
+        What each bucket is for. Default value is :attr:`CooldownScope.user`.
+    """
+
+    def __init__(self, rate, per, scope=CooldownScope.user):
+        if rate < 1 or per <= 0:
+            raise ValueError('rate must be at least 1 and per must be positive')
+        self.rate = rate
+        self.per = per
+        self.scope = scope
+        self._interval = per / rate
+        # key -> monotonic time the key's bucket is full again
+        self._full_at = {}
+        self._sweep_at = 64
+
+    def __repr__(self):
+        return f'<ReactionCooldown rate={self.rate} per={self.per} scope={self.scope}>'
+
+    def __len__(self):
+        return len(self._full_at)
+
+    def get_retry_after(self, ctx):
+        """Seconds until ``ctx`` can be let through, ``0`` if it can now.
+        Doesn't use up the cooldown.
+
+        Returns
+        -------
+        :class:`float`
+        """
+        full_at = self._full_at.get(self.scope.get_key(ctx))
+        if full_at is None:
+            return 0.0
+        return max(0.0, full_at - time.monotonic() - self.per + self._interval)
+
+    def update_rate_limit(self, ctx):
+        """Uses up the cooldown for ``ctx`` if it isn't on cooldown.
+
+        Returns
+        -------
+        Optional[:class:`float`]
+            Seconds until ``ctx`` can be let through, or ``None`` if it was.
+        """
+        now = time.monotonic()
+        if len(self._full_at) >= self._sweep_at:
+            self._sweep(now)
+        key = self.scope.get_key(ctx)
+        full_at = max(self._full_at.get(key, now), now)
+        retry_after = full_at - now - self.per + self._interval
+        if retry_after > 0:
+            return retry_after
+        self._full_at[key] = full_at + self._interval
+        return None
+
+    def reset(self, ctx=None):
+        """Resets the cooldown for ``ctx``, or every key if ``None``."""
+        if ctx is None:
+            self._full_at.clear()
+        else:
+            self._full_at.pop(self.scope.get_key(ctx), None)
+
+    def _sweep(self, now):
+        for key in [key for key, full_at in self._full_at.items() if full_at <= now]:
+            del self._full_at[key]
+        self._sweep_at = max(64, len(self._full_at) * 2)
@@ -2,8 +2,9 @@ import discord
 from discord.ext import commands
 from discord.ext.commands.converter import get_converter
 
-from .utils import scrub_emojis
-from .reactionerrors import ReactionOnlyCommand
+from .utils import _normalize_emoji
+from .reactionerrors import ReactionOnlyCommand, ExecutorSaturated, ReactionOnCooldown
+from .reactionexecutor import _resolve_executor
 
 __all__ = ('ReactionCommand',
            'ReactionGroup',
@@ -12,6 +13,15 @@ __all__ = ('ReactionCommand',
            'ReactionCommandMixin',
            'ReactionGroupMixin')
 
+# bumped on every command added or removed anywhere in a command tree,
+# caches built from the tree compare against it
+_tree_version = 0
+
+
+def _command_tree_changed():
+    global _tree_version
+    _tree_version += 1
+
 
 class _EmojiInsensitiveDict(dict):
 
@@ -19,22 +29,168 @@ class _EmojiInsensitiveDict(dict):
         super().__init__(*args, **kwargs)
 
     def __contains__(self, k):
-        return super().__contains__(scrub_emojis(k))
+        return super().__contains__(_normalize_emoji(k))
 
     def __delitem__(self, k):
-        return super().__delitem__(scrub_emojis(k))
+        return super().__delitem__(_normalize_emoji(k))
 
     def __getitem__(self, k):
-        return super().__getitem__(scrub_emojis(k))
+        return super().__getitem__(_normalize_emoji(k))
 
     def get(self, k, default=None):
-        return super().get(scrub_emojis(k), default)
+        return super().get(_normalize_emoji(k), default)
 
     def pop(self, k, default=None):
-        return super().pop(scrub_emojis(k), default)
+        return super().pop(_normalize_emoji(k), default)
 
     def __setitem__(self, k, v):
-        super().__setitem__(scrub_emojis(k), v)
+        super().__setitem__(_normalize_emoji(k), v)
+
+
+class _EmojiTrie:
+    """Character trie built from one level of ``emoji_mapping``.
+
+    Never modified after it's built, a new one is made when the mapping
+    changes instead.
+    """
+
+    __slots__ = ('children', 'command')
+
+    def __init__(self):
+        self.children = {}
+        self.command = None
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        root = cls()
+        for key, command in mapping.items():
+            node = root
+            for char in key:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = cls()
+                node = child
+            node.command = command
+        return root
+
+    def prefixes(self, text):
+        """Returns ``(end, command)`` for every key that ``text`` starts with,
+        shortest first.
+        """
+        found = []
+        node = self
+        for index, char in enumerate(text):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.command is not None:
+                found.append((index + 1, node.command))
+        return found
+
+
+class _TrieCursor:
+    """Walks a command tree one emoji at a time, as they're added to a
+    listening session.
+
+    Follows every way the emojis so far could still be read, like
+    :meth:`ReactionGroupMixin._walk_reaction_trie` does all at once, so it
+    can tell when only one command is possible no matter what's added next.
+    """
+
+    __slots__ = ('root', 'states', '_fed', '_history')
+
+    # more than this and the cursor gives up, never completing early
+    MAX_STATES = 64
+
+    def __init__(self, root):
+        self.root = root
+        self.states = None
+        self.reset()
+
+    def reset(self):
+        # (group, trie node) or (None, command) once a leaf was followed by whitespace
+        self.states = [(self.root, self.root._reaction_trie)]
+        # emojis fed so far and the states from before each of them
+        self._fed = []
+        self._history = []
+
+    def rewind(self, emojis):
+        """Goes back to the states from before the first emoji that differs
+        from ``emojis``, then feeds the rest of ``emojis``. Undoing the last
+        emoji is just a pop.
+        """
+        emojis = list(emojis)
+        keep = 0
+        for fed, emoji in zip(self._fed, emojis):
+            if fed != emoji:
+                break
+            keep += 1
+        if keep < len(self._fed):
+            self.states = self._history[keep]
+            del self._fed[keep:]
+            del self._history[keep:]
+        for emoji in emojis[keep:]:
+            self.feed(emoji)
+
+    def feed(self, emoji):
+        self._fed.append(emoji)
+        self._history.append(self.states)
+        states = []
+        for group, node in self.states:
+            if group is None:
+                # anything after a finished command is ignored
+                states.append((group, node))
+                continue
+            text = _normalize_emoji(emoji) if group._emoji_insensitive else emoji
+            current = [(group, node)]
+            for char in text:
+                current = self._step(current, char)
+            states.extend(current)
+        self.states = states if len(states) <= self.MAX_STATES else []
+
+    @staticmethod
+    def _step(states, char):
+        ret = []
+        for group, node in states:
+            if group is None:
+                ret.append((group, node))
+                continue
+            root = group._reaction_trie
+            command = node.command
+            if char.isspace():
+                if node is root:
+                    ret.append((group, node))
+                elif isinstance(command, ReactionGroupMixin):
+                    ret.append((command, command._reaction_trie))
+                elif command is not None:
+                    ret.append((None, command))
+                continue
+            child = node.children.get(char)
+            if child is not None:
+                ret.append((group, child))
+            if node is not root and isinstance(command, ReactionGroupMixin):
+                # subcommand right after the group's emojis
+                child = command._reaction_trie.children.get(char)
+                if child is not None:
+                    ret.append((command, child))
+        return ret
+
+    def leaf(self):
+        """Returns the command if every way of reading the emojis so far ends
+        at the same command without subcommands, otherwise ``None``.
+        """
+        found = None
+        for group, node in self.states:
+            if group is None:
+                command = node
+            elif node.children or node.command is None or isinstance(node.command, ReactionGroupMixin):
+                return None
+            else:
+                command = node.command
+            if found is not None and command is not found:
+                return None
+            found = command
+        return found
 
 
 class ReactionCommandMixin:
@@ -56,6 +212,15 @@ class ReactionCommandMixin:
         .. warning::
             Can get a lot of unwanted commands with this set to ``True``.
             Be careful.
+    executor: Optional[Union[:class:`str`, :class:`.ReactionExecutor`]]
+        ``'thread'`` or ``'process'`` to use the shared pool of that kind, or a
+        :class:`.ReactionExecutor`. Blocking work run with
+        :meth:`ReactionContext.run_in_executor() <.ReactionContext.run_in_executor>`
+        goes to this pool. Defaults to ``None``.
+    reaction_cooldown: Optional[:class:`.ReactionCooldown`]
+        Cooldown for invoking the command from reactions, on top of any
+        :func:`~discord.ext.commands.cooldown`. Raises
+        :exc:`.ReactionOnCooldown` when hit. Defaults to ``None``.
     """
 
     def __init__(self, *args, **kwargs):
@@ -66,12 +231,16 @@ class ReactionCommandMixin:
         self.invoke_with_message = kwargs.get('invoke_with_message', True)
         self.invoke_without_prefix = kwargs.get('invoke_without_prefix', False)
         self.emojis = [emojis] if isinstance(emojis, str) else list(emojis)
+        self.executor = _resolve_executor(kwargs.get('executor'))
+        self.reaction_cooldown = kwargs.get('reaction_cooldown')
+        self._reaction_arg_plan = None
 
     async def can_run(self, ctx):
         """Overwritten to also raise
         :exc:`.ReactionOnlyCommand` for commands that have
         :attr:`invoke_with_message <.ReactionCommand.invoke_with_message>`
-        set to ``False``.
+        set to ``False`` and :exc:`.ExecutorSaturated` when the command's
+        executor is full.
 
         Otherwise the same as :meth:`can_run() <discord.ext.commands.Command.can_run>`.
 
@@ -94,8 +263,77 @@ class ReactionCommandMixin:
             raise commands.DisabledCommand(f'{self.name} command is disabled')
         if not getattr(ctx, 'reaction_command', False) and not self.invoke_with_message:
             raise ReactionOnlyCommand(f'{self.name} command is only usable with reactions')
+        if self.executor is not None and self.executor.saturated:
+            self.executor.rejected += 1
+            raise ExecutorSaturated(self.executor)
         return await super().can_run(ctx)
 
+    def _prepare_cooldowns(self, ctx):
+        super()._prepare_cooldowns(ctx)
+        cooldown = self.reaction_cooldown
+        if cooldown is not None and getattr(ctx, 'reaction_command', False):
+            retry_after = cooldown.update_rate_limit(ctx)
+            if retry_after is not None:
+                raise ReactionOnCooldown(cooldown, retry_after)
+
+    def _get_reaction_arg_plan(self):
+        """Default args and kwargs for reaction invokes. They're the same for
+        every invoke so they're only worked out again if :attr:`params` or
+        :attr:`cog` changes.
+
+        Returns
+        -------
+        Tuple[list, dict, list]
+            Positional args after ``ctx``, keyword only args, and
+            ``(index, name, converter)`` for flags that need to be constructed
+            on each invoke. ``name`` is ``None`` for positional flags.
+        """
+        plan = self._reaction_arg_plan
+        if plan is not None and plan[0] is self.params and plan[1] is self.cog:
+            return plan[2]
+
+        iterator = iter(self.params.items())
+
+        if self.cog is not None:
+            # we have 'self' as the first parameter so just advance
+            # the iterator and resume parsing
+            try:
+                next(iterator)
+            except StopIteration:
+                raise discord.ClientException(f'Callback for {self.name} command is missing "self" parameter.')
+
+        # next we have the 'ctx' as the next parameter
+        try:
+            next(iterator)
+        except StopIteration:
+            raise discord.ClientException(f'Callback for {self.name} command is missing "ctx" parameter.')
+
+        # index of the first arg after ctx in ctx.args
+        offset = 1 if self.cog is None else 2
+        args = []
+        kwargs = {}
+        flags = []
+        for name, param in iterator:
+            converter = get_converter(param)
+            if hasattr(converter, '__commands_is_flag__'):
+                arg = None
+                constructible = converter._can_be_constructible()
+            else:
+                arg = None if param.default is param.empty else param.default
+                constructible = False
+            if param.kind == param.KEYWORD_ONLY:
+                kwargs[name] = arg
+                if constructible:
+                    flags.append((None, name, converter))
+            else:
+                if constructible:
+                    flags.append((offset + len(args), None, converter))
+                args.append(arg)
+
+        plan = (args, kwargs, flags)
+        self._reaction_arg_plan = (self.params, self.cog, plan)
+        return plan
+
     async def _parse_arguments(self, ctx):
         """
         .. Warning::
@@ -111,37 +349,16 @@ class ReactionCommandMixin:
         is_reaction = getattr(ctx, 'reaction_command', False)
 
         if is_reaction:
+            args, kwargs, flags = self._get_reaction_arg_plan()
             ctx.args = [ctx] if self.cog is None else [self.cog, ctx]
-            ctx.kwargs = {}
-            args = ctx.args
-            kwargs = ctx.kwargs
-            iterator = iter(self.params.items())
-
-            if self.cog is not None:
-                # we have 'self' as the first parameter so just advance
-                # the iterator and resume parsing
-                try:
-                    next(iterator)
-                except StopIteration:
-                    raise discord.ClientException(f'Callback for {self.name} command is missing "self" parameter.')
-
-
-            # next we have the 'ctx' as the next parameter
-            try:
-                next(iterator)
-            except StopIteration:
-                raise discord.ClientException(f'Callback for {self.name} command is missing "ctx" parameter.')
-
-            for name, param in iterator:
-                converter = get_converter(param)
-                if hasattr(converter, '__commands_is_flag__'):
-                    arg = (await converter._construct_default(ctx)) if converter._can_be_constructible() else None
-                else:
-                    arg = None if param.default is param.empty else param.default
-                if param.kind == param.KEYWORD_ONLY:
-                    kwargs[name] = arg
+            ctx.args.extend(args)
+            ctx.kwargs = kwargs.copy()
+            for index, name, converter in flags:
+                arg = await converter._construct_default(ctx)
+                if name is None:
+                    ctx.args[index] = arg
                 else:
-                    args.append(arg)
+                    ctx.kwargs[name] = arg
         else:
             await super()._parse_arguments(ctx)
 
@@ -164,8 +381,51 @@ class ReactionGroupMixin:
 
     def __init__(self, *args, **kwargs):
         self.emoji_mapping = _EmojiInsensitiveDict() if kwargs.get('emoji_insensitive') else {}
+        self._reaction_trie_cache = None
         super().__init__(*args, **kwargs)
 
+    @property
+    def _reaction_trie(self):
+        trie = self._reaction_trie_cache
+        if trie is None:
+            trie = self._reaction_trie_cache = _EmojiTrie.from_mapping(self.emoji_mapping)
+        return trie
+
+    def _walk_reaction_trie(self, text):
+        """Resolves ``text`` to the deepest command it can reach.
+
+        Emojis of each level can be separated by whitespace
+        (:attr:`~.ReactionBot.listening_emoji`) or directly follow each
+        other. Keys can be made of multiple emojis.
+
+        Returns
+        -------
+        Tuple[list[tuple[:class:`str`, :class:`.ReactionCommand`]], :class:`str`]
+            ``(trigger, command)`` for each level matched and the rest of
+            ``text`` that wasn't matched.
+        """
+        if self._emoji_insensitive:
+            text = _normalize_emoji(text)
+        for end, command in reversed(self._reaction_trie.prefixes(text)):
+            trigger, rest = text[:end], text[end:]
+            if rest and isinstance(command, ReactionGroupMixin):
+                path, remaining = command._walk_reaction_trie(rest.lstrip())
+                if path:
+                    path.insert(0, (trigger, command))
+                    return path, remaining
+            # only a full emoji key if it ends here
+            if not rest or rest[0].isspace():
+                return [(trigger, command)], rest
+        return [], text
+
+    @property
+    def _emoji_insensitive(self):
+        return isinstance(self.emoji_mapping, _EmojiInsensitiveDict)
+
+    def _emoji_key(self, emoji):
+        """Returns the key ``emoji`` is stored as in :attr:`emoji_mapping`."""
+        return _normalize_emoji(emoji) if self._emoji_insensitive else emoji
+
     @property
     def reaction_commands(self):
         """set[:class:`.ReactionCommand`]: Unique registered reaction commands.
@@ -196,8 +456,10 @@ class ReactionGroupMixin:
             else:
                 for emoji in command.emojis:
                     self.emoji_mapping[emoji] = command
+                self._reaction_trie_cache = None
         except AttributeError as e:
             super().add_command(command)
+        _command_tree_changed()
 
     def remove_command(self, name):
         """Remove a command to the internal list by name.
@@ -221,6 +483,7 @@ class ReactionGroupMixin:
         # does not exist
         if command is None:
             return None
+        _command_tree_changed()
 
         if name in command.aliases:
             # we're removing an alias so we don't want to remove the rest
@@ -230,6 +493,7 @@ class ReactionGroupMixin:
             if name and command:
                 for emoji in command.emojis:
                     self.emoji_mapping.pop(emoji, None)
+                self._reaction_trie_cache = None
         except AttributeError:
             pass
         # we're not removing the alias so let's delete the rest of them.
@@ -263,6 +527,9 @@ class ReactionGroupMixin:
     def get_reaction_command(self, name):
         """Gets a command by emoji.
 
+        Subcommands can be found by separating emojis of each level with a
+        space or putting them directly after each other.
+
         Parameters
         ----------
         name: :class:`str`
@@ -273,20 +540,10 @@ class ReactionGroupMixin:
         Optional[:class:`.ReactionCommand`]
             The command or ``None``
         """
-        if ' ' not in name:
-            return self.emoji_mapping.get(name)
-        names = name.split(' ')
-        if not names:
+        path, rest = self._walk_reaction_trie(name)
+        if not path or rest.strip():
             return None
-        obj = self.emoji_mapping.get(names[0])
-        if not isinstance(obj, ReactionGroupMixin):
-            return obj
-        for name in names[1:]:
-            try:
-                obj = obj.emoji_mapping[name]
-            except (AttributeError, KeyError):
-                return None
-        return obj
+        return path[-1][1]
 
     def reaction_command(self, emojis, *args, **kwargs):
         """Decorator that creates and adds a command to the internal list of
@@ -410,12 +667,18 @@ class ReactionGroup(ReactionGroupMixin, ReactionCommandMixin, commands.Group):
 
             view = ctx.view
             previous = view.index
-            view.skip_ws()
-            trigger = view.get_word()
-
-            if trigger:
+            # already resolved by the bot for reaction sessions
+            path = getattr(ctx, '_reaction_path', None)
+            if path:
+                trigger, ctx.invoked_subcommand = path.popleft()
                 ctx.subcommand_passed = trigger
-                ctx.invoked_subcommand = self.get_reaction_command(trigger)
+            else:
+                view.skip_ws()
+                trigger = view.get_word()
+                if trigger:
+                    ctx.subcommand_passed = trigger
+                    if path is None:
+                        ctx.invoked_subcommand = self.get_reaction_command(trigger)
 
             if early_invoke:
                 injected = commands.core.hooked_wrapped_callback(self, ctx, self.callback)
@@ -444,6 +707,9 @@ def reaction_command(emojis, name=None, cls=None, **attrs):
         An emoji or list of emojis that can be used to invoke this command.
     invoke_with_message: Optional[:class:`bool`]
         Whether the command can be invoked from messages. Default value is ``True``.
+    executor: Optional[Union[:class:`str`, :class:`.ReactionExecutor`]]
+        ``'thread'``, ``'process'`` or a :class:`.ReactionExecutor` to run
+        blocking work in, see :meth:`.ReactionContext.run_in_executor`.
 
     Returns
     -------
@@ -1,9 +1,39 @@
 from discord.ext import commands
 
-__all__ = ('ReactionOnlyCommand',)
+__all__ = ('ReactionOnlyCommand', 'ExecutorSaturated', 'ReactionOnCooldown')
 
 class ReactionOnlyCommand(commands.CommandError):
     """Subclass of :exc:`~discord.ext.commands.CommandError`. Similar to
     :exc:`~discord.ext.commands.DisabledCommand`. Nothing added here.
     """
     pass
+
+class ExecutorSaturated(commands.CommandError):
+    """Subclass of :exc:`~discord.ext.commands.CommandError`. Raised when a
+    command's :class:`.ReactionExecutor` has too many jobs queued.
+
+    Attributes
+    ----------
+    executor: :class:`.ReactionExecutor`
+        The executor that's saturated.
+    """
+    def __init__(self, executor):
+        self.executor = executor
+        super().__init__(f'{executor.kind} executor is busy, {executor.queued} jobs queued')
+
+class ReactionOnCooldown(commands.CommandOnCooldown):
+    """Subclass of :exc:`~discord.ext.commands.CommandOnCooldown`. Raised
+    when a command's :attr:`~.ReactionCommand.reaction_cooldown` is hit, so
+    it's handled the same as a normal cooldown.
+
+    Attributes
+    ----------
+    cooldown: :class:`.ReactionCooldown`
+        The cooldown that was hit.
+    type: :class:`.CooldownScope`
+        The cooldown's scope.
+    retry_after: :class:`float`
+        Seconds until the command can be invoked from reactions again.
+    """
+    def __init__(self, cooldown, retry_after):
+        super().__init__(cooldown, retry_after, cooldown.scope)
@@ -0,0 +1,140 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .reactionerrors import ExecutorSaturated
+
+__all__ = ('ReactionExecutor',)
+
+
+class ReactionExecutor:
+    """Bounded thread or process pool for running blocking parts of
+    commands off the event loop, so they don't hold up listening sessions.
+
+    Commands made with ``executor='thread'`` or ``executor='process'`` share
+    one default pool of that kind. Pass an instance as ``executor`` instead to
+    give commands their own pool.
+
+    Jobs over ``max_workers`` wait in the pool's queue. Once the queue is full
+    new jobs are rejected with :exc:`.ExecutorSaturated` instead of piling up.
+
+    Parameters
+    ----------
+    kind: :class:`str`
+        ``'thread'`` or ``'process'``. Functions run in a process pool have to
+        be picklable. Default value is ``'thread'``.
+    max_workers: Optional[:class:`int`]
+        Max jobs running at once. Defaults to the same as
+        :class:`concurrent.futures.ThreadPoolExecutor` for threads and
+        :func:`os.cpu_count` for processes.
+    max_queue: Optional[:class:`int`]
+        Max jobs waiting for a worker. Defaults to ``max_workers * 2``.
+
+    Attributes
+    ----------
+    in_flight: :class:`int`
+        Jobs running or waiting in the queue.
+    completed: :class:`int`
+        Jobs that finished, including ones that raised.
+    rejected: :class:`int`
+        Jobs rejected because the queue was full.
+    """
+
+    _defaults = {}
+
+    def __init__(self, kind='thread', *, max_workers=None, max_queue=None):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"executor kind must be 'thread' or 'process', not {kind!r}")
+        if max_workers is None:
+            cpus = os.cpu_count() or 1
+            max_workers = min(32, cpus + 4) if kind == 'thread' else cpus
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_workers * 2 if max_queue is None else max_queue
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = None
+
+    @classmethod
+    def default(cls, kind):
+        """Gets the shared pool used for ``executor=kind``."""
+        executor = cls._defaults.get(kind)
+        if executor is None:
+            executor = cls._defaults[kind] = cls(kind)
+        return executor
+
+    @property
+    def queued(self):
+        """:class:`int`: Jobs waiting for a worker."""
+        return max(0, self.in_flight - self.max_workers)
+
+    @property
+    def saturated(self):
+        """:class:`bool`: Whether new jobs would be rejected right now."""
+        return self.in_flight >= self.max_workers + self.max_queue
+
+    def stats(self):
+        """Returns the current queue depth and counters.
+
+        Returns
+        -------
+        dict[:class:`str`, :class:`int`]
+            ``in_flight``, ``queued``, ``completed`` and ``rejected``.
+        """
+        return {'in_flight': self.in_flight,
+                'queued': self.queued,
+                'completed': self.completed,
+                'rejected': self.rejected}
+
+    def _get_executor(self):
+        if self._executor is None:
+            cls = ThreadPoolExecutor if self.kind == 'thread' else ProcessPoolExecutor
+            self._executor = cls(max_workers=self.max_workers)
+        return self._executor
+
+    def _done(self, future):
+        self.in_flight -= 1
+        self.completed += 1
+
+    def _job_done(self, loop, future):
+        # called from a pool thread
+        try:
+            loop.call_soon_threadsafe(self._done, future)
+        except RuntimeError:
+            # loop is closed
+            self._done(future)
+
+    async def run(self, func, *args, **kwargs):
+        """Runs ``func(*args, **kwargs)`` in the pool and waits for the result.
+
+        Raises
+        ------
+        :exc:`.ExecutorSaturated`
+            The queue is full.
+        """
+        if self.saturated:
+            self.rejected += 1
+            raise ExecutorSaturated(self)
+        if kwargs:
+            func = functools.partial(func, **kwargs)
+        # tracked on the pool's future, the job keeps its slot until it
+        # actually finishes even if the command awaiting it is cancelled
+        future = self._get_executor().submit(func, *args)
+        self.in_flight += 1
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(functools.partial(self._job_done, loop))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def shutdown(self, wait=True):
+        """Shuts down the pool. It's started again if more jobs are run."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def _resolve_executor(executor):
+    if executor is None or isinstance(executor, ReactionExecutor):
+        return executor
+    return ReactionExecutor.default(executor)
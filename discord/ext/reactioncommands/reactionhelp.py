@@ -3,11 +3,16 @@ import re
 import discord
 from discord.ext import commands
 
+from . import reactioncore
 from .reactioncore import ReactionCommandMixin
 from .reactioncontext import ReactionContext
 
 __all__ = ('ReactionHelp',)
 
+# rendered help kept for each key, for different check results
+_MAX_PAGE_VARIANTS = 8
+_MAX_PAGE_KEYS = 256
+
 
 class ReactionHelp(commands.DefaultHelpCommand):
     """Help command for reaction commands and normal commands. Subclassed from
@@ -31,6 +36,17 @@ class ReactionHelp(commands.DefaultHelpCommand):
 
         Only show reaction commands from reaction invoke, only show commands that
         can be invoked from a message from message invoke.
+
+    .. note::
+        Rendered help is cached until a command is added or removed. Checks
+        are still run for commands that have them, and help is rendered again
+        if their results changed. Subcommands added to or removed from a
+        plain :class:`~discord.ext.commands.Group` aren't seen as a change,
+        so group help is also cached by the group's current subcommands.
+        Call :meth:`clear_cache` after changing
+        :attr:`~discord.ext.commands.Command.hidden`,
+        :attr:`~discord.ext.commands.Command.enabled`, or anything else shown
+        in help at runtime.
     """
 
     def __init__(self, *args, **kwargs):
@@ -40,6 +56,37 @@ class ReactionHelp(commands.DefaultHelpCommand):
         self.regional_pattern = re.compile('[\U0001f1e6-\U0001f1ff]')
 
         super().__init__(*args, **kwargs)
+        # used when this isn't added to a bot
+        self._cache = None
+        # (command, passed) for checks run while rendering
+        self._check_results = None
+        self._rendered = None
+
+    def _get_cache(self):
+        """Cache shared by every copy of this help command made for an
+        invoke, kept on the command that's added to the bot.
+        """
+        impl = getattr(self, '_command_impl', None)
+        owner = impl if impl is not None else self
+        if owner._cache is None or owner._cache['version'] != reactioncore._tree_version:
+            owner._cache = {'version': reactioncore._tree_version,
+                            'mapping': None,
+                            'labels': {},
+                            'pages': {}}
+        return owner._cache
+
+    def clear_cache(self):
+        """Clears the cached command mapping and rendered help."""
+        impl = getattr(self, '_command_impl', None)
+        (impl if impl is not None else self)._cache = None
+
+    def _emoji_label(self, emojis):
+        labels = self._get_cache()['labels']
+        key = tuple(emojis)
+        label = labels.get(key)
+        if label is None:
+            label = labels[key] = ','.join(map(self.filter_regional, emojis))
+        return label
 
     def filter_regional(self, emojis):
         """Helper method that uses regex to sub in '\\\\u200b' to prevent regional
@@ -82,7 +129,7 @@ class ReactionHelp(commands.DefaultHelpCommand):
         prefix = '' if getattr(self.context, "reaction_command", False) else self.context.clean_prefix
 
         if getattr(command, "emojis", []):
-            emojis = ','.join(map(self.filter_regional, command.emojis)) +'\n'
+            emojis = self._emoji_label(command.emojis) + '\n'
         else:
             emojis = ''
         return '%s%s%s %s' % (emojis, prefix, alias, command.signature)
@@ -99,7 +146,7 @@ class ReactionHelp(commands.DefaultHelpCommand):
         for command in commands:
             command_emojis = getattr(command, 'emojis', None)
             if command_emojis:
-                emojis = ','.join(map(self.filter_regional, command.emojis))
+                emojis = self._emoji_label(command_emojis)
                 entry = '{0}{1} | **{2}** {3}'.format(self.indent * '\u200a',
                                                       emojis,
                                                       command.name,
@@ -112,25 +159,146 @@ class ReactionHelp(commands.DefaultHelpCommand):
                 self.paginator.add_line(self.shorten_text(entry))
 
     async def filter_commands(self, commands, *, sort=False, key=None):
-        """Modified to also filter :attr:`ReactionHelp.match_command_type`."""
+        """Modified to also filter :attr:`ReactionHelp.match_command_type`.
+
+        Checks are only run for commands that have any, see
+        :meth:`needs_check`.
+        """
         if self.match_command_type:
             if getattr(self.context, 'reaction_command', False):
                 commands = (cmd for cmd in commands if isinstance(cmd, ReactionCommandMixin))
             else:
                 commands = (cmd for cmd in commands if getattr(cmd, 'invoke_with_message', True))
-        return await super().filter_commands(commands, sort=sort, key=key)
+
+        if sort and key is None:
+            key = lambda c: c.name
+        iterator = commands if self.show_hidden else (cmd for cmd in commands if not cmd.hidden)
+        if self.verify_checks is False or (self.verify_checks is None and not self.context.guild):
+            return sorted(iterator, key=key) if sort else list(iterator)
+
+        ret = []
+        for cmd in iterator:
+            if not self.needs_check(cmd) or await self._passes_checks(cmd):
+                ret.append(cmd)
+        if sort:
+            ret.sort(key=key)
+        return ret
+
+    def needs_check(self, command):
+        """Whether :meth:`~discord.ext.commands.Command.can_run` has to be
+        called to know if ``command`` can run. Commands without checks, cog
+        checks, or global checks always can.
+
+        Parameters
+        ----------
+        command: :class:`~discord.ext.commands.Command`
+            The command to check.
+
+        Returns
+        -------
+        :class:`bool`
+        """
+        if command.checks or not command.enabled or self.context.bot._checks:
+            return True
+        if not getattr(command, 'invoke_with_message', True) or getattr(command, 'executor', None):
+            return True
+        if type(command).can_run not in (commands.Command.can_run, ReactionCommandMixin.can_run):
+            return True
+        cog = command.cog
+        return cog is not None and commands.Cog._get_overridden_method(cog.cog_check) is not None
+
+    async def _passes_checks(self, command):
+        try:
+            passed = await command.can_run(self.context)
+        except commands.CommandError:
+            passed = False
+        if self._check_results is not None:
+            self._check_results.append((command, passed))
+        return passed
 
     def get_bot_mapping(self):
         """Same as :meth:`~discord.ext.commands.HelpCommand.get_bot_mapping`.
+        Cached until a command is added or removed.
 
         :meta private:
         """
-        bot = self.context.bot
-        mapping = {}
-        for command in bot.commands:
-            mapping.setdefault(command.cog, []).append(command)
+        cache = self._get_cache()
+        mapping = cache['mapping']
+        if mapping is None:
+            mapping = {}
+            for command in self.context.bot.commands:
+                mapping.setdefault(command.cog, []).append(command)
+            cache['mapping'] = mapping
         return mapping
 
+    async def send_pages(self):
+        """Sends the pages from :attr:`paginator`, and keeps them so the same
+        help can be sent again without rendering it.
+        """
+        pages = self.paginator.pages
+        if self._check_results is not None:
+            self._rendered = (tuple(self._check_results), pages)
+        await self._send_page_list(pages)
+
+    async def _send_page_list(self, pages):
+        destination = self.get_destination()
+        for page in pages:
+            await destination.send(page)
+
+    async def _send_cached(self, target, render, *args):
+        """Sends help for ``target`` from the cache, or renders it with
+        ``render(*args)`` and caches it.
+        """
+        ctx = self.context
+        cache = self._get_cache()['pages']
+        key = (target,
+               getattr(ctx, 'reaction_command', False),
+               ctx.guild is None,
+               ctx.clean_prefix,
+               self.invoked_with)
+        variants = cache.get(key, ())
+        for checks, pages in variants:
+            # same help if every check that was run has the same result
+            for command, passed in checks:
+                try:
+                    result = await command.can_run(ctx)
+                except commands.CommandError:
+                    result = False
+                if result != passed:
+                    break
+            else:
+                return await self._send_page_list(pages)
+
+        self._check_results = []
+        self._rendered = None
+        try:
+            ret = await render(*args)
+        finally:
+            self._check_results = None
+        if self._rendered is not None:
+            if len(cache) >= _MAX_PAGE_KEYS:
+                cache.clear()
+            cache[key] = [self._rendered, *cache.get(key, ())][:_MAX_PAGE_VARIANTS]
+        return ret
+
+    async def send_bot_help(self, mapping):
+        """Same as :meth:`~discord.ext.commands.DefaultHelpCommand.send_bot_help`, cached."""
+        return await self._send_cached(None, super().send_bot_help, mapping)
+
+    async def send_cog_help(self, cog):
+        """Same as :meth:`~discord.ext.commands.DefaultHelpCommand.send_cog_help`, cached."""
+        return await self._send_cached(('cog', cog.qualified_name), super().send_cog_help, cog)
+
+    async def send_group_help(self, group):
+        """Same as :meth:`~discord.ext.commands.DefaultHelpCommand.send_group_help`, cached."""
+        # plain Groups don't bump the tree version when subcommands change
+        key = ('command', group.qualified_name, frozenset(map(id, group.commands)))
+        return await self._send_cached(key, super().send_group_help, group)
+
+    async def send_command_help(self, command):
+        """Same as :meth:`~discord.ext.commands.DefaultHelpCommand.send_command_help`, cached."""
+        return await self._send_cached(('command', command.qualified_name), super().send_command_help, command)
+
     async def command_callback(self, ctx, *, command=None):
         """Nothing changed if help was invoked from a message.
 
@@ -153,18 +321,18 @@ class ReactionHelp(commands.DefaultHelpCommand):
 
             cmd = bot.get_reaction_command(keys[0])
             if cmd is None:
-                string = await maybe_coro(self.command_not_found, self.remove_mentions(keys[0]))
+                string = await discord.utils.maybe_coroutine(self.command_not_found, self.remove_mentions(keys[0]))
                 return await self.send_error_message(string)
 
             for key in keys[1:]:
                 try:
                     found = cmd.get_reaction_command(key)
                 except AttributeError:
-                    string = await maybe_coro(self.subcommand_not_found, cmd, self.remove_mentions(key))
+                    string = await discord.utils.maybe_coroutine(self.subcommand_not_found, cmd, self.remove_mentions(key))
                     return await self.send_error_message(string)
                 else:
                     if found is None:
-                        string = await maybe_coro(self.subcommand_not_found, cmd, self.remove_mentions(key))
+                        string = await discord.utils.maybe_coroutine(self.subcommand_not_found, cmd, self.remove_mentions(key))
                         return await self.send_error_message(string)
                     cmd = found
             if isinstance(cmd, commands.Group):
@@ -189,3 +357,5 @@ class _ReactionHelpCommandImpl(ReactionCommandMixin, commands.help._HelpCommandI
     def __init__(self, inject, *args, **kwargs):
         kwargs['emojis'] = inject.emojis
         super().__init__(inject, *args, **kwargs)
+        # shared by the copies of the help command made for each invoke
+        self._cache = None
@@ -0,0 +1,165 @@
+import os
+import time
+import asyncio
+from bisect import bisect_left
+
+__all__ = ('CallbackSink', 'HistogramSink', 'PrometheusFileSink')
+
+
+class CallbackSink:
+    """Metrics sink that calls a function for every stage recorded.
+
+    Passing a plain callable as ``metrics_sink`` to :class:`.ReactionBot`
+    wraps it in this.
+
+    Parameters
+    ----------
+    callback: Callable[[:class:`str`, :class:`float`, :class:`.ReactionContext`], Any]
+        Called with the stage name, seconds since the reaction was received,
+        and the context.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def record(self, stage, elapsed, ctx):
+        self.callback(stage, elapsed, ctx)
+
+
+class HistogramSink:
+    """Metrics sink that keeps an in memory histogram per stage.
+
+    Parameters
+    ----------
+    buckets: Optional[Iterable[:class:`float`]]
+        Upper bounds of the histogram buckets in seconds. Defaults to
+        :attr:`DEFAULT_BUCKETS`.
+
+    Attributes
+    ----------
+    buckets: tuple[:class:`float`]
+        Sorted upper bounds of the histogram buckets.
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                       1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        # stage -> [bucket counts, sum, count]
+        self._stages = {}
+
+    def record(self, stage, elapsed, ctx):
+        data = self._stages.get(stage)
+        if data is None:
+            data = self._stages[stage] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        data[0][bisect_left(self.buckets, elapsed)] += 1
+        data[1] += elapsed
+        data[2] += 1
+
+    def clear(self):
+        """Removes everything recorded so far."""
+        self._stages.clear()
+
+    def snapshot(self):
+        """Returns the histograms recorded so far.
+
+        Returns
+        -------
+        dict[:class:`str`, :class:`dict`]
+            Mapping of stage to a dict with ``buckets`` (cumulative counts
+            keyed by upper bound, ending with ``inf``), ``sum`` and ``count``.
+        """
+        bounds = self.buckets + (float('inf'),)
+        snapshot = {}
+        for stage, (counts, total, count) in self._stages.items():
+            cumulative = []
+            running = 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            snapshot[stage] = {'buckets': dict(zip(bounds, cumulative)),
+                               'sum': total,
+                               'count': count}
+        return snapshot
+
+
+class PrometheusFileSink(HistogramSink):
+    """:class:`HistogramSink` that also writes its histograms to a file in
+    the Prometheus text exposition format, for the node exporter textfile
+    collector or similar.
+
+    The file is written at most once every ``interval`` seconds when a stage is
+    recorded, or when :meth:`write` is called. It's replaced atomically so
+    readers never see a partial file. Writes from recording a stage are done
+    in the loop's default executor so they don't block the event loop.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        File to write to.
+    buckets: Optional[Iterable[:class:`float`]]
+        Same as :class:`HistogramSink`.
+    interval: :class:`float`
+        Minimum seconds between writes. Default value is ``15``.
+    name: :class:`str`
+        Metric name. Default value is ``'reaction_stage_seconds'``.
+    """
+
+    def __init__(self, path, *, buckets=None, interval=15.0, name='reaction_stage_seconds'):
+        super().__init__(buckets)
+        self.path = path
+        self.interval = interval
+        self.name = name
+        self._last_write = time.monotonic()
+        # executor future of the write in progress
+        self._writing = None
+
+    def record(self, stage, elapsed, ctx):
+        super().record(stage, elapsed, ctx)
+        if self._writing is None and time.monotonic() - self._last_write >= self.interval:
+            self._last_write = time.monotonic()
+            text = self.render()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return self._write_text(text)
+            self._writing = loop.run_in_executor(None, self._write_text, text)
+            self._writing.add_done_callback(self._written)
+
+    def _written(self, future):
+        self._writing = None
+        # raises in the callback so the loop's exception handler logs it
+        future.result()
+
+    def render(self):
+        """Returns the histograms in the Prometheus text exposition format.
+
+        Returns
+        -------
+        :class:`str`
+            The text that :meth:`write` writes.
+        """
+        name = self.name
+        lines = [f'# HELP {name} Seconds from receiving a reaction to each reaction command stage.',
+                 f'# TYPE {name} histogram']
+        for stage, data in self.snapshot().items():
+            for bound, count in data['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {data["sum"]!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {data["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """Writes :meth:`render` to :attr:`path` right away. This blocks,
+        don't call it from the event loop often.
+        """
+        self._last_write = time.monotonic()
+        self._write_text(self.render())
+
+    def _write_text(self, text):
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, self.path)
@@ -3,7 +3,8 @@ import discord
 __all__ = ('ProxyMessage', 'ProxyPayload')
 
 class ProxyBase:
-    """Base class for Proxy objects
+    """Base class for Proxy objects. Has no ``__dict__``, attributes are
+    stored in the ``__slots__`` of the discord class it's combined with.
 
     Parameters
     ----------
@@ -17,6 +18,9 @@ class ProxyBase:
     id: :class:`int`
         the id for object this is proxying
     """
+
+    __slots__ = ()
+
     def __init__(self, bot, id):
         self._state = bot._connection
         self.id = id
@@ -24,7 +28,8 @@ class ProxyBase:
 
 class ProxyUser(ProxyBase, discord.User):
     """Proxy for :class:`discord.User`"""
-    pass
+
+    __slots__ = ()
 
 
 class ProxyMember(ProxyBase, discord.Member):
@@ -36,8 +41,12 @@ class ProxyMember(ProxyBase, discord.Member):
         Guild this proxy member belongs to
     """
 
+    __slots__ = ()
+
     def __init__(self, bot, id, guild):
-        super().__init__(bot, id)
+        # Member.id comes from Member._user
+        self._state = bot._connection
+        self._user = ProxyUser(bot, id)
         self.guild = guild
 
 
@@ -49,27 +58,40 @@ class ProxyTextChannel(ProxyBase, discord.TextChannel):
     guild: Union[:class:`discord.Guild`, :class:`~discord.ext.reactioncommands.reactionproxy.ProxyGuild`]
         Guild this proxy channel belongs to
     """
+
+    __slots__ = ()
+
     def __init__(self, bot, id, guild):
         super().__init__(bot, id)
         self.guild = guild
+        # ChannelType.text, needed for PartialMessage
+        self._type = 0
 
 class ProxyDMChannel(ProxyBase, discord.DMChannel):
     """Proxy for :class:`discord.DMChannel`
 
     Attributes
     ----------
-    recepient: Union[:class:`discord.User`, :class:`~discord.ext.reactioncommands.reactionproxy.ProxyUser`]
+    recipient: Union[:class:`discord.User`, :class:`~discord.ext.reactioncommands.reactionproxy.ProxyUser`]
         User this is a DM with
     """
 
+    __slots__ = ()
+
     def __init__(self, bot, id, user):
         super().__init__(bot, id)
-        self.recepient = user
+        self.recipient = user
+
+    @property
+    def recepient(self):
+        """Alias of :attr:`recipient` kept for compatibility."""
+        return self.recipient
 
 
 class ProxyGuild(ProxyBase, discord.Guild):
     """Proxy class for :class:`discord.Guild`"""
-    pass
+
+    __slots__ = ()
 
 
 class ProxyPayload:
@@ -100,6 +122,9 @@ class ProxyPayload:
         ``None`` unless manually passed in
     """
 
+    __slots__ = ('channel_id', 'message_id', 'guild_id', 'emoji', 'member',
+                 'user_id', 'event_type')
+
     def __init__(self, **kwargs):
         self.channel_id = kwargs.get('channel_id')
         self.message_id = kwargs.get('message_id')
@@ -179,6 +204,9 @@ class ProxyMessage:
     guild: Optional[:class:`discord.Guild`]
         ``bot.get_guild`` on :attr:`payload.guild_id <discord.RawReactionActionEvent.guild_id>`
     """
+
+    __slots__ = ('id', 'author', 'channel', 'guild')
+
     def __init__(self, id, author, channel, guild):
         self.id = id
         self.author = author
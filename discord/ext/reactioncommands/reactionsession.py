@@ -0,0 +1,580 @@
+import time
+import asyncio
+from enum import Enum
+from collections import deque
+from contextlib import contextmanager
+
+import discord
+
+__all__ = ('SessionScope', 'OverflowPolicy', 'SessionLimits')
+
+# extra seconds a claim is kept after listen_total_timeout, covers
+# adding the listening emoji and anything else before the session ends
+_GUARD_GRACE = 10
+
+
+class SessionScope(Enum):
+    """How many listening sessions a user can have at once. Passed as
+    ``session_scope`` to :class:`.ReactionBot`.
+
+    Attributes
+    ----------
+    user
+        One session per user. The default.
+    channel
+        One session per user in each channel.
+    message
+        One session per user on each message.
+    """
+    user = 0
+    channel = 1
+    message = 2
+
+    def get_key(self, ctx):
+        payload = ctx.payload
+        if self is SessionScope.user:
+            return ctx.author.id
+        elif self is SessionScope.channel:
+            return (ctx.author.id, payload.channel_id)
+        return (ctx.author.id, payload.message_id)
+
+
+class OverflowPolicy(Enum):
+    """What :class:`SessionLimits` does with a session that's over a limit.
+
+    Attributes
+    ----------
+    drop
+        Ignore the prefix reaction. The default.
+    queue
+        Wait for a free slot, up to :attr:`SessionLimits.queue_timeout`
+        seconds, then drop.
+    reply
+        Drop, and send :attr:`SessionLimits.overflow_message` in the channel.
+        Sent at most once a minute for each message.
+    """
+    drop = 0
+    queue = 1
+    reply = 2
+
+
+class SessionLimits:
+    """Limits how many listening sessions run at once and how fast new ones
+    start. Passed as ``session_limits`` to :class:`.ReactionBot`.
+
+    Limits are checked after the prefix emoji matched and before the
+    listening emoji is added, so sessions over a limit don't make any
+    requests. ``reaction_overflow`` is dispatched with the context for every
+    session that's dropped.
+
+    Parameters
+    ----------
+    max_sessions: Optional[:class:`int`]
+        Max sessions at once for the whole bot.
+    per_guild: Optional[:class:`int`]
+        Max sessions at once in a guild. DMs count per channel.
+    per_message: Optional[:class:`int`]
+        Max sessions at once on a message.
+    rate: Optional[:class:`int`]
+        Max sessions that can start every ``per`` seconds, as a token bucket.
+        Up to ``rate`` sessions can start in a burst.
+    per: :class:`float`
+        Seconds for ``rate``. Default value is ``1``.
+    overflow: :class:`OverflowPolicy`
+        What to do with sessions over a limit. Default value is
+        :attr:`OverflowPolicy.drop`.
+    queue_timeout: :class:`float`
+        Max seconds a session waits with :attr:`OverflowPolicy.queue`.
+        Default value is ``5``.
+    max_queue: :class:`int`
+        Max sessions waiting with :attr:`OverflowPolicy.queue`, extra ones
+        are dropped. Default value is ``100``.
+    overflow_message: :class:`str`
+        Sent with :attr:`OverflowPolicy.reply`. Default value is
+        ``'Too busy right now, try again in a bit.'``
+
+    Attributes
+    ----------
+    active: :class:`int`
+        Sessions running now.
+    admitted: :class:`int`
+        Sessions that were allowed to start.
+    dropped: :class:`int`
+        Sessions that were dropped.
+    """
+
+    def __init__(self, *, max_sessions=None, per_guild=None, per_message=None, rate=None, per=1.0,
+                 overflow=OverflowPolicy.drop, queue_timeout=5.0, max_queue=100,
+                 overflow_message='Too busy right now, try again in a bit.'):
+        self.max_sessions = max_sessions
+        self.per_guild = per_guild
+        self.per_message = per_message
+        self.rate = rate
+        self.per = per
+        self.overflow = overflow
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.overflow_message = overflow_message
+
+        self.active = 0
+        self.admitted = 0
+        self.dropped = 0
+        self._guilds = {}
+        self._messages = {}
+        self._tokens = rate
+        self._refilled_at = time.monotonic()
+        self._waiters = deque()
+        # message id -> when it can be replied to again
+        self._replied = {}
+
+    def stats(self):
+        """Returns the current counts.
+
+        Returns
+        -------
+        dict[:class:`str`, :class:`int`]
+            ``active``, ``queued``, ``admitted`` and ``dropped``.
+        """
+        return {'active': self.active,
+                'queued': len(self._waiters),
+                'admitted': self.admitted,
+                'dropped': self.dropped}
+
+    @staticmethod
+    def _keys(ctx):
+        payload = ctx.payload
+        return payload.guild_id or payload.channel_id, payload.message_id
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._refilled_at) * self.rate / self.per)
+        self._refilled_at = now
+
+    def _retry_after(self, guild_id, message_id):
+        """``0`` if a session can start now, ``None`` if it has to wait for a
+        session to end, otherwise seconds until a token is available.
+        """
+        if self.max_sessions is not None and self.active >= self.max_sessions:
+            return None
+        if self.per_guild is not None and self._guilds.get(guild_id, 0) >= self.per_guild:
+            return None
+        if self.per_message is not None and self._messages.get(message_id, 0) >= self.per_message:
+            return None
+        if self.rate is not None:
+            self._refill()
+            if self._tokens < 1:
+                return (1 - self._tokens) * self.per / self.rate
+        return 0
+
+    def _admit(self, guild_id, message_id):
+        if self.rate is not None:
+            self._tokens -= 1
+        self.active += 1
+        self.admitted += 1
+        self._guilds[guild_id] = self._guilds.get(guild_id, 0) + 1
+        self._messages[message_id] = self._messages.get(message_id, 0) + 1
+
+    async def acquire(self, ctx):
+        """Tries to start a session for ``ctx``, waiting if the overflow
+        policy is :attr:`OverflowPolicy.queue`.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the session can start. If ``True``, :meth:`release` has to
+            be called when it ends.
+        """
+        guild_id, message_id = self._keys(ctx)
+        # don't skip ahead of sessions already waiting
+        if not self._waiters and self._retry_after(guild_id, message_id) == 0:
+            self._admit(guild_id, message_id)
+            return True
+
+        if self.overflow is OverflowPolicy.queue and len(self._waiters) < self.max_queue:
+            if await self._wait(guild_id, message_id):
+                return True
+
+        self.dropped += 1
+        ctx.bot.dispatch('reaction_overflow', ctx)
+        if self.overflow is OverflowPolicy.reply:
+            await self._reply(ctx, message_id)
+        return False
+
+    async def _wait(self, guild_id, message_id):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout
+        event = asyncio.Event()
+        self._waiters.append(event)
+        try:
+            while True:
+                retry_after = None
+                if self._waiters[0] is event:
+                    retry_after = self._retry_after(guild_id, message_id)
+                    if retry_after == 0:
+                        self._admit(guild_id, message_id)
+                        return True
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    return False
+                if retry_after is not None:
+                    timeout = min(timeout, retry_after)
+                event.clear()
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waiters.remove(event)
+            self._wake_next()
+
+    def _wake_next(self):
+        if self._waiters:
+            self._waiters[0].set()
+
+    def release(self, ctx):
+        """Ends a session started with :meth:`acquire`."""
+        guild_id, message_id = self._keys(ctx)
+        self.active -= 1
+        for counts, key in ((self._guilds, guild_id), (self._messages, message_id)):
+            count = counts.get(key, 0) - 1
+            if count > 0:
+                counts[key] = count
+            else:
+                counts.pop(key, None)
+        self._wake_next()
+
+    async def _reply(self, ctx, message_id):
+        now = time.monotonic()
+        if self._replied.get(message_id, 0) > now:
+            return
+        if len(self._replied) >= 1024:
+            self._replied = {key: until for key, until in self._replied.items() if until > now}
+        self._replied[message_id] = now + 60
+        try:
+            await ctx.channel.send(self.overflow_message)
+        except discord.HTTPException:
+            pass
+
+
+class _SessionGuard:
+    """Keeps users from starting more sessions than their
+    :class:`SessionScope` allows.
+
+    Claims are plain dict entries of key to expiry time, so checking,
+    claiming and releasing are synchronous and O(1). Claims expire on their
+    own in case a session ends without being released.
+    """
+
+    __slots__ = ('scope', '_claims', '_sweep_at')
+
+    def __init__(self, scope=SessionScope.user):
+        self.scope = scope
+        self._claims = {}
+        self._sweep_at = 64
+
+    def __len__(self):
+        return len(self._claims)
+
+    def check(self, ctx):
+        """Whether ``ctx`` could start a session right now."""
+        key = self.scope.get_key(ctx)
+        expires = self._claims.get(key)
+        if expires is None:
+            return True
+        if expires <= time.monotonic():
+            del self._claims[key]
+            return True
+        return False
+
+    def claim(self, ctx, timeout):
+        """Claims a session for ``ctx`` that expires after ``timeout``
+        seconds, or never if ``None``.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the claim succeeded.
+        """
+        if not self.check(ctx):
+            return False
+        expires = float('inf') if timeout is None else time.monotonic() + timeout + _GUARD_GRACE
+        self._claims[self.scope.get_key(ctx)] = expires
+        if len(self._claims) >= self._sweep_at:
+            self._sweep()
+        return True
+
+    def release(self, ctx):
+        self._claims.pop(self.scope.get_key(ctx), None)
+
+    def _sweep(self):
+        now = time.monotonic()
+        for key in [key for key, expires in self._claims.items() if expires <= now]:
+            del self._claims[key]
+        self._sweep_at = max(64, len(self._claims) * 2)
+
+
+class _ListeningSession:
+    """Reactions routed to one listening session and its timeouts.
+
+    Runs inside the coroutine that awaits :meth:`next_payload`, no extra
+    tasks. Both timeouts share one ``loop.call_at`` handle. Resetting the
+    idle timeout only moves :attr:`idle_deadline`, the handle re-arms itself
+    for the new deadline when it fires instead of being recreated for every
+    reaction.
+    """
+
+    __slots__ = ('loop', 'ctx', 'check', 'idle_timeout', 'deadline', 'idle_deadline',
+                 'expired', '_inbox', '_waiter', '_timer')
+
+    def __init__(self, loop, ctx=None, *, check=None, idle_timeout=None, total_timeout=None,
+                 first_idle_timeout=None):
+        self.loop = loop
+        self.ctx = ctx
+        self.check = check
+        self.idle_timeout = idle_timeout
+        now = loop.time()
+        # resumed sessions start with what was left of the idle timeout
+        if first_idle_timeout is None:
+            first_idle_timeout = idle_timeout
+        self.deadline = float('inf') if total_timeout is None else now + total_timeout
+        self.idle_deadline = float('inf') if first_idle_timeout is None else now + first_idle_timeout
+        # None while listening, otherwise 'idle', 'total', 'closed' or 'cancelled'
+        self.expired = None
+        self._inbox = deque()
+        self._waiter = None
+        self._timer = None
+        self._arm()
+
+    def _arm(self):
+        when = min(self.deadline, self.idle_deadline)
+        if when != float('inf'):
+            self._timer = self.loop.call_at(when, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        now = self.loop.time()
+        if now >= self.deadline:
+            self.expired = 'total'
+        elif now >= self.idle_deadline:
+            self.expired = 'idle'
+        else:
+            # idle deadline moved since this was scheduled
+            self._arm()
+            return
+        self._wake()
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def feed(self, payload):
+        """Adds a payload from the router.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the session accepted it.
+        """
+        if self.expired is not None or (self.check is not None and not self.check(payload)):
+            return False
+        self._inbox.append(payload)
+        if self.idle_timeout is not None:
+            self.idle_deadline = self.loop.time() + self.idle_timeout
+        self._wake()
+        return True
+
+    async def next_payload(self):
+        """Waits for the next payload. Returns ``None`` once the session
+        expired, :attr:`expired` says why.
+        """
+        while True:
+            if self.expired == 'total':
+                return None
+            if self._inbox:
+                return self._inbox.popleft()
+            if self.expired is not None:
+                return None
+            self._waiter = self.loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def close(self, reason='closed'):
+        """Stops the session. Reasons other than ``'closed'`` drop any
+        payloads that weren't read yet.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.expired is None:
+            self.expired = reason
+        if reason != 'closed':
+            self._inbox.clear()
+        self._wake()
+
+
+class _EmojiBuffer:
+    """Emojis of a command being entered, in order. Appending and removing
+    the last occurrence of an emoji are both O(1).
+
+    A circular doubly linked list of ``[prev, next, emoji]`` nodes, with a
+    stack of nodes for each emoji so its last occurrence is found without
+    searching.
+    """
+
+    __slots__ = ('_root', '_nodes')
+
+    def __init__(self):
+        root = self._root = []
+        root[:] = [root, root, None]
+        self._nodes = {}
+
+    def __len__(self):
+        return sum(len(nodes) for nodes in self._nodes.values())
+
+    def __iter__(self):
+        root = self._root
+        node = root[1]
+        while node is not root:
+            yield node[2]
+            node = node[1]
+
+    def __str__(self):
+        return ''.join(self)
+
+    def last(self):
+        """The emoji added last, ``None`` if empty."""
+        return self._root[0][2]
+
+    def append(self, emoji):
+        root = self._root
+        prev = root[0]
+        node = [prev, root, emoji]
+        prev[1] = root[0] = node
+        self._nodes.setdefault(emoji, []).append(node)
+
+    def remove(self, emoji):
+        """Removes the last occurrence of ``emoji``.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether ``emoji`` was in the buffer.
+        """
+        nodes = self._nodes.get(emoji)
+        if not nodes:
+            return False
+        prev, next, _ = node = nodes.pop()
+        prev[1] = next
+        next[0] = prev
+        node[:] = ()
+        if not nodes:
+            del self._nodes[emoji]
+        return True
+
+
+class _SessionRouter:
+    """Routes raw reaction payloads directly to listening sessions.
+
+    Sessions are keyed by ``(message_id, user_id)`` so finding the sessions
+    a payload belongs to is a single dict lookup no matter how many sessions
+    are listening. Sessions are also indexed by message id and user id alone
+    for lookups from outside the session.
+    """
+
+    __slots__ = ('_sessions', '_by_message', '_by_user')
+
+    def __init__(self):
+        self._sessions = {}
+        self._by_message = {}
+        self._by_user = {}
+
+    def __len__(self):
+        return sum(len(sessions) for sessions in self._by_message.values())
+
+    def sessions(self, message_id=None, user_id=None):
+        """Returns a list of registered sessions, optionally only the ones
+        on ``message_id`` and/or for ``user_id``.
+        """
+        if message_id is not None and user_id is not None:
+            return list(self._sessions.get((message_id, user_id), ()))
+        elif message_id is not None:
+            return list(self._by_message.get(message_id, ()))
+        elif user_id is not None:
+            return list(self._by_user.get(user_id, ()))
+        return [session for sessions in self._by_message.values() for session in sessions]
+
+    def register(self, key, session):
+        """Starts routing payloads for ``key`` to ``session``."""
+        message_id, user_id = key
+        self._sessions.setdefault(key, []).append(session)
+        self._by_message.setdefault(message_id, set()).add(session)
+        self._by_user.setdefault(user_id, set()).add(session)
+
+    def unregister(self, key, session):
+        message_id, user_id = key
+        sessions = self._sessions.get(key)
+        if sessions:
+            sessions[:] = [s for s in sessions if s is not session]
+            if not sessions:
+                del self._sessions[key]
+        for index, id in ((self._by_message, message_id), (self._by_user, user_id)):
+            sessions = index.get(id)
+            if sessions is not None:
+                sessions.discard(session)
+                if not sessions:
+                    del index[id]
+
+    @contextmanager
+    def listen(self, key, session):
+        """Registers ``session`` for the ``with`` block. It's always closed
+        and unregistered at the end, even if the block raises or is cancelled.
+        """
+        self.register(key, session)
+        try:
+            yield session
+        finally:
+            session.close()
+            self.unregister(key, session)
+
+    def route(self, payload):
+        """Feeds ``payload`` to every matching session.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether any session accepted the payload.
+        """
+        sessions = self._sessions.get((payload.message_id, payload.user_id))
+        if not sessions:
+            return False
+        routed = False
+        for session in sessions:
+            routed = session.feed(payload) or routed
+        return routed
+
+
+class _ShardSessions:
+    """Session state for one shard. Keeps sessions, claims and cached emojis
+    of different shards apart so a shard can drop its own sessions.
+    """
+
+    __slots__ = ('shard_id', 'router', 'guard', 'emoji_cache', 'started', 'rejected')
+
+    def __init__(self, shard_id, scope):
+        self.shard_id = shard_id
+        self.router = _SessionRouter()
+        self.guard = _SessionGuard(scope)
+        # (attr, guild or channel id) -> (expires, emojis)
+        self.emoji_cache = {}
+        self.started = 0
+        self.rejected = 0
+
+    def stats(self):
+        return {'sessions': len(self.router),
+                'claims': len(self.guard),
+                'started': self.started,
+                'rejected': self.rejected,
+                'cached_emojis': len(self.emoji_cache)}
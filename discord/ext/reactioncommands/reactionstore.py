@@ -0,0 +1,236 @@
+import asyncio
+import json
+import sqlite3
+
+__all__ = ('SessionRecord', 'SessionStore', 'MemorySessionStore', 'SQLiteSessionStore')
+
+
+class SessionRecord:
+    """Checkpoint of a listening session, saved to a :class:`SessionStore`.
+
+    Attributes
+    ----------
+    message_id: :class:`int`
+        The message the session is on.
+    channel_id: :class:`int`
+        The message's channel.
+    guild_id: Optional[:class:`int`]
+        The message's guild, ``None`` in DMs.
+    user_id: :class:`int`
+        The user entering the command.
+    prefix: :class:`str`
+        The prefix emoji that started the session.
+    listening_emoji: Optional[:class:`str`]
+        The listening emoji added for the session.
+    emojis: list[:class:`str`]
+        Emojis entered so far, ``' '`` for the listening emoji.
+    deadline: Optional[:class:`float`]
+        Unix time the session ends at, from :attr:`~.ReactionBot.listen_total_timeout`.
+    idle_deadline: Optional[:class:`float`]
+        Unix time the session ends at if nothing else is added, from
+        :attr:`~.ReactionBot.listen_timeout`.
+    remove_after: list[tuple[:class:`str`, :class:`int`]]
+        ``(emoji, user id)`` of reactions to remove when the session ends.
+    """
+
+    __slots__ = ('message_id', 'channel_id', 'guild_id', 'user_id', 'prefix', 'listening_emoji',
+                 'emojis', 'deadline', 'idle_deadline', 'remove_after')
+
+    def __init__(self, *, message_id, channel_id, guild_id, user_id, prefix, listening_emoji=None,
+                 emojis=(), deadline=None, idle_deadline=None, remove_after=()):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.prefix = prefix
+        self.listening_emoji = listening_emoji
+        self.emojis = list(emojis)
+        self.deadline = deadline
+        self.idle_deadline = idle_deadline
+        self.remove_after = [tuple(pair) for pair in remove_after]
+
+    def __repr__(self):
+        return f'<SessionRecord message_id={self.message_id} user_id={self.user_id} emojis={self.emojis!r}>'
+
+    @property
+    def key(self):
+        """tuple[:class:`int`, :class:`int`]: ``(message_id, user_id)``"""
+        return (self.message_id, self.user_id)
+
+    def expires_at(self):
+        """Unix time the session ends at if nothing else is added, ``None``
+        if it never does.
+        """
+        deadlines = [d for d in (self.deadline, self.idle_deadline) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class SessionStore:
+    """Base class for where listening sessions are checkpointed, passed as
+    ``session_store`` to :class:`.ReactionBot`.
+
+    Subclass this and implement :meth:`save`, :meth:`delete` and
+    :meth:`load`. The bot calls them in an executor thread, one call at a
+    time, and batches writes so a record is saved at most once every
+    quarter second however many emojis were added.
+    """
+
+    def save(self, record):
+        """Saves ``record``, replacing any record with the same
+        :attr:`~SessionRecord.key`.
+
+        Parameters
+        ----------
+        record: :class:`SessionRecord`
+            The record to save.
+        """
+        raise NotImplementedError
+
+    def delete(self, message_id, user_id):
+        """Deletes the record for ``message_id`` and ``user_id`` if there is one."""
+        raise NotImplementedError
+
+    def load(self):
+        """Returns every saved record.
+
+        Returns
+        -------
+        list[:class:`SessionRecord`]
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Releases anything the store holds open."""
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """Keeps records in a dict. Survives reconnects, not restarts."""
+
+    def __init__(self):
+        self._records = {}
+
+    def save(self, record):
+        self._records[record.key] = SessionRecord.from_dict(record.to_dict())
+
+    def delete(self, message_id, user_id):
+        self._records.pop((message_id, user_id), None)
+
+    def load(self):
+        return [SessionRecord.from_dict(record.to_dict()) for record in self._records.values()]
+
+
+class SQLiteSessionStore(SessionStore):
+    """Keeps records in a SQLite database file. Survives restarts.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        Path of the database file, created if it doesn't exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # only used from one thread at a time, see _StoreWriter
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS reaction_sessions ('
+                         'message_id INTEGER NOT NULL, '
+                         'user_id INTEGER NOT NULL, '
+                         'data TEXT NOT NULL, '
+                         'PRIMARY KEY (message_id, user_id))')
+
+    def save(self, record):
+        self._db.execute('INSERT OR REPLACE INTO reaction_sessions VALUES (?, ?, ?)',
+                         (record.message_id, record.user_id, json.dumps(record.to_dict())))
+
+    def delete(self, message_id, user_id):
+        self._db.execute('DELETE FROM reaction_sessions WHERE message_id = ? AND user_id = ?',
+                         (message_id, user_id))
+
+    def load(self):
+        rows = self._db.execute('SELECT data FROM reaction_sessions').fetchall()
+        return [SessionRecord.from_dict(json.loads(data)) for data, in rows]
+
+    def close(self):
+        self._db.close()
+
+
+# seconds between batched writes
+_WRITE_DELAY = 0.25
+
+
+class _StoreWriter:
+    """Runs a :class:`SessionStore` in the default executor so the loop never
+    waits on it. Writes are queued by key and flushed together after
+    :data:`_WRITE_DELAY`, so only the last save of a record before a flush
+    is written, and a session that ends before then just deletes its key.
+    """
+
+    def __init__(self, store, delay=_WRITE_DELAY):
+        self.store = store
+        self.delay = delay
+        # key -> record to save, or None to delete
+        self._pending = {}
+        self._task = None
+        # serializes executor calls, stores only see one call at a time
+        self._lock = asyncio.Lock()
+
+    def save(self, record):
+        self._pending[record.key] = record
+        self._schedule()
+
+    def delete(self, message_id, user_id):
+        self._pending[(message_id, user_id)] = None
+        self._schedule()
+
+    def _schedule(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        try:
+            while self._pending:
+                await asyncio.sleep(self.delay)
+                try:
+                    await self.flush()
+                except Exception as e:
+                    # keep flushing later writes, the loop's exception handler logs it
+                    asyncio.get_running_loop().call_exception_handler({
+                        'message': 'Failed writing to session store',
+                        'exception': e,
+                    })
+        finally:
+            self._task = None
+
+    async def flush(self):
+        """Writes everything queued so far."""
+        async with self._lock:
+            if not self._pending:
+                return
+            # copy records on the loop, they keep changing while this runs
+            writes = [(key, None if record is None else SessionRecord.from_dict(record.to_dict()))
+                      for key, record in self._pending.items()]
+            self._pending.clear()
+            await asyncio.get_running_loop().run_in_executor(None, self._write, writes)
+
+    def _write(self, writes):
+        for key, record in writes:
+            if record is None:
+                self.store.delete(*key)
+            else:
+                self.store.save(record)
+
+    async def load(self):
+        """Flushes queued writes, then loads every record."""
+        await self.flush()
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(None, self.store.load)
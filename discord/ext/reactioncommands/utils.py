@@ -1,17 +1,39 @@
 import re
+from functools import lru_cache
 
-#skin colors, male/female symbol, man/woman
-_to_clean = re.compile('\U0001f3fb|\U0001f3fc|\U0001f3fd|\U0001f3fe|\U0001f3ff|' \
-                       '\u200d[\u2642\u2640]\ufe0f|'\
-                       '[\U0001f469\U0001f468]')
+# str.translate table, characters to remove map to None
+_scrub_table = {
+    # skin colors
+    **dict.fromkeys(range(0x1f3fb, 0x1f400)),
+    # variation selectors, emoji/text presentation
+    0xfe0e: None,
+    0xfe0f: None,
+    # man/woman -> adult
+    0x1f468: 0x1f9d1,
+    0x1f469: 0x1f9d1,
+    # boy/girl -> child
+    0x1f466: 0x1f9d2,
+    0x1f467: 0x1f9d2,
+    # old man/old woman -> older adult
+    0x1f474: 0x1f9d3,
+    0x1f475: 0x1f9d3,
+}
+# male/female symbol and hair styles joined on with ZWJ, after the table
+# already removed their variation selectors
+_zwj_modifiers = re.compile('\u200d[\u2640\u2642\U0001f9b0-\U0001f9b3]')
+# single characters that scrub_emojis would change on their own
+_scrubbed_chars = frozenset(map(chr, _scrub_table))
 
 def scrub_emojis(emoji):
-    """Uses regex to remove skin color modifiers and gender modifiers.
+    """Removes skin color modifiers, gender modifiers, hair styles, and
+    variation selectors.
 
     Ex: 👍🏿/👍🏾/👍🏽/👍🏼/👍🏻 --> 👍
 
     🧙‍♂️/🧙‍♀️ --> 🧙
 
+    👨‍🦰/👩‍🦰 --> 🧑
+
     Parameters
     ----------
     emoji: :class:`str`
@@ -22,9 +44,20 @@ def scrub_emojis(emoji):
     :class:`str`
         the input text scrubbed of modifiers
     """
-    def repl(m):
-        #replace MAN/WOMAN with ADULT
-        if m[0] in '\U0001f469\U0001f468':
-            return '\U0001f9d1'
-        return ''
-    return _to_clean.sub(repl, emoji)
+    emoji = emoji.translate(_scrub_table)
+    if '\u200d' in emoji:
+        emoji = _zwj_modifiers.sub('', emoji)
+    return emoji
+
+
+@lru_cache(maxsize=2048)
+def _cached_scrub(emoji):
+    return scrub_emojis(emoji)
+
+def _normalize_emoji(emoji):
+    """Same result as :func:`scrub_emojis` but cached, and skips scrubbing
+    for single characters that can't have modifiers.
+    """
+    if len(emoji) == 1 and emoji not in _scrubbed_chars:
+        return emoji
+    return _cached_scrub(emoji)